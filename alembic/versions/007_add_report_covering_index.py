@@ -0,0 +1,29 @@
+"""Add covering index for report aggregates
+
+Revision ID: 007_add_report_covering_index
+Revises: 006_add_myr_currency
+Create Date: 2025-06-30 10:00:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '007_add_report_covering_index'
+down_revision = '006_add_myr_currency'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    # Personal reports also filter on company_id IS NULL, so it sits among the equality columns
+    op.create_index(
+        'idx_user_active_date_cat',
+        'transactions',
+        ['user_id', 'company_id', 'is_deleted', 'transaction_date', 'category_id', 'amount_primary']
+    )
+
+
+def downgrade():
+    op.drop_index('idx_user_active_date_cat', table_name='transactions')
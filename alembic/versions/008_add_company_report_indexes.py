@@ -0,0 +1,28 @@
+"""Index company report lookups
+
+Revision ID: 008_add_company_report_indexes
+Revises: 007_add_report_covering_index
+Create Date: 2025-07-01 10:00:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '008_add_company_report_indexes'
+down_revision = '007_add_report_covering_index'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    op.create_index(
+        'idx_company_status_transaction',
+        'company_transactions',
+        ['company_id', 'status', 'transaction_id']
+    )
+
+
+def downgrade():
+    op.drop_index('idx_company_status_transaction', table_name='company_transactions')
@@ -0,0 +1,58 @@
+"""Move the notifications flag out of users.settings into its own column
+
+Revision ID: 009_add_user_notifications_enabled
+Revises: 008_add_company_report_indexes
+Create Date: 2025-07-03 10:00:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '009_add_user_notifications_enabled'
+down_revision = '008_add_company_report_indexes'
+branch_labels = None
+depends_on = None
+
+
+users = sa.table(
+    'users',
+    sa.column('id', sa.BigInteger),
+    sa.column('settings', sa.JSON),
+    sa.column('notifications_enabled', sa.Boolean)
+)
+
+
+def upgrade():
+    op.add_column(
+        'users',
+        sa.Column('notifications_enabled', sa.Boolean(), nullable=False, server_default=sa.true())
+    )
+    
+    # Backfill from the JSON key in Python; JSON path syntax differs between MySQL and SQLite
+    conn = op.get_bind()
+    rows = conn.execute(sa.select(users.c.id, users.c.settings).where(users.c.settings.isnot(None))).fetchall()
+    for user_id, user_settings in rows:
+        if not user_settings or 'notifications_enabled' not in user_settings:
+            continue
+        
+        enabled = bool(user_settings.pop('notifications_enabled'))
+        conn.execute(
+            users.update()
+            .where(users.c.id == user_id)
+            .values(notifications_enabled=enabled, settings=user_settings)
+        )
+
+
+def downgrade():
+    conn = op.get_bind()
+    rows = conn.execute(
+        sa.select(users.c.id, users.c.settings).where(users.c.notifications_enabled == sa.false())
+    ).fetchall()
+    for user_id, user_settings in rows:
+        user_settings = dict(user_settings or {})
+        user_settings['notifications_enabled'] = False
+        conn.execute(users.update().where(users.c.id == user_id).values(settings=user_settings))
+    
+    op.drop_column('users', 'notifications_enabled')
@@ -98,6 +98,7 @@ async def process_analytics_choice(callback: CallbackQuery, state: FSMContext):
             self.answer = callback_query.message.answer
             self.answer_document = callback_query.message.answer_document
             self.answer_photo = callback_query.message.answer_photo
+            self.answer_media_group = callback_query.message.answer_media_group
     
     fake_message = FakeMessage(callback)
     
@@ -7,6 +7,7 @@ from aiogram.utils.keyboard import InlineKeyboardBuilder
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from src.database import get_session
+from src.bot.middlewares.user_context import invalidate_user_context
 from src.services.user import UserService
 from src.services.currency import currency_service
 from src.utils.text_parser import ExpenseParser
@@ -66,7 +67,7 @@ async def cmd_rates(message: Message):
             
             # Format rate
             rate_str = f"{rate:.4f}".rstrip('0').rstrip('.')
-            currency_symbol = expense_parser.CURRENCY_SYMBOLS.get(
+            currency_symbol = expense_parser.SYMBOLS_BY_CURRENCY.get(
                 base_currency, base_currency
             )
             
@@ -127,8 +128,9 @@ async def cmd_convert(message: Message):
             usage += "Или: /convert 50 EUR KZT\n\n"
             usage += "Поддерживаемые валюты:\n"
             
+            symbols = expense_parser.SYMBOLS_BY_CURRENCY
             for currency in settings.supported_currencies:
-                symbol = expense_parser.CURRENCY_SYMBOLS.get(currency, '')
+                symbol = symbols.get(currency, '')
                 usage += f"{symbol} {currency}\n"
             
             await message.answer(usage)
@@ -283,9 +285,10 @@ async def show_rates_settings(callback: CallbackQuery):
         # Create currency selection keyboard
         builder = InlineKeyboardBuilder()
         
+        symbols = expense_parser.SYMBOLS_BY_CURRENCY
         for currency in settings.supported_currencies:
             if currency != user.primary_currency:
-                symbol = expense_parser.CURRENCY_SYMBOLS.get(currency, '')
+                symbol = symbols.get(currency, '')
                 builder.add(
                     InlineKeyboardButton(
                         text=f"{symbol} {currency}",
@@ -316,6 +319,7 @@ async def set_primary_currency(callback: CallbackQuery):
     telegram_id = callback.from_user.id
     
     async with get_session() as session:
+        invalidate_user_context(session, telegram_id)
         await user_service.update_user_currency(session, telegram_id, currency)
         
         user = await user_service.get_user_by_telegram_id(session, telegram_id)
@@ -1,14 +1,18 @@
 import io
+import asyncio
 import logging
-from typing import Optional
+from types import MappingProxyType
+from typing import Any, Awaitable, Callable, Optional, Tuple
 from decimal import Decimal
 from datetime import datetime
 from aiogram import Router, F
 from aiogram.filters import StateFilter
-from aiogram.types import Message, CallbackQuery, PhotoSize
+from aiogram.types import Message, CallbackQuery, PhotoSize, InlineKeyboardMarkup, InlineKeyboardButton
 from aiogram.fsm.context import FSMContext
+from cachetools import LRUCache
 
 from src.database import get_session
+from src.database.models import Category, User
 from src.bot.states import ReceiptStates
 from src.bot.keyboards import (
     get_default_categories_keyboard,
@@ -43,23 +47,145 @@ expense_parser = ExpenseParser()
 caption_parser = CaptionParser()
 clarification_helper = ClarificationHelper()
 
+# Map AI category to our default categories
+_CATEGORY_MAP = MappingProxyType({
+    'food': 'food',
+    'transport': 'transport',
+    'shopping': 'shopping',
+    'utilities': 'home',  # Mobile operators go to home/utilities
+    'health': 'health',
+    'entertainment': 'entertainment',
+    'donation': 'donation',
+    'other': 'other'
+})
+
+# Duplicate confirmation keyboards are static per locale, so build them once
+_DUP_KEYBOARDS = {
+    locale: InlineKeyboardMarkup(inline_keyboard=[
+        [
+            InlineKeyboardButton(
+                text=i18n.get("buttons.yes", locale),
+                callback_data="confirm_duplicate_photo"
+            ),
+            InlineKeyboardButton(
+                text=i18n.get("buttons.no", locale),
+                callback_data="cancel_duplicate_photo"
+            )
+        ]
+    ])
+    for locale in settings.supported_languages
+}
+
+# Receipt summary header per locale; only the OCR values are filled in per photo
+_RECEIPT_TEMPLATES = {
+    locale: (
+        f"{i18n.get('receipt.found', locale)}\n"
+        f"{i18n.get('receipt.amount', locale)}: {{amount}}\n"
+        f"{i18n.get('receipt.date', locale)}: {{date}}\n"
+    )
+    for locale in settings.supported_languages
+}
+_RECEIPT_PLACE_TEMPLATES = {
+    locale: f"{i18n.get('receipt.place', locale)}: {{merchant}}\n"
+    for locale in settings.supported_languages
+}
+
+# Common Decimal values, built once
+_D_ONE = Decimal('1.0000')
+_D_ZERO = Decimal('0')
+
+# Per-user id of the default 'other' category, used when a mapped category is missing
+_other_category_ids = LRUCache(maxsize=10_000)
+
 # Log router registration
 logger.info("Photo handler router initialized")
 
 
+def _load_tx_decimals(data: dict) -> Tuple[Decimal, Decimal, Decimal, Decimal]:
+    """Parse amount, amount_primary, exchange_rate and ocr_confidence from FSM data once"""
+    amount = Decimal(data['amount'])
+    amount_primary = Decimal(data['amount_primary']) if 'amount_primary' in data else amount
+    exchange_rate = Decimal(data['exchange_rate']) if 'exchange_rate' in data else _D_ONE
+    raw_confidence = data.get('ocr_confidence')
+    if not raw_confidence:
+        ocr_confidence = _D_ZERO
+    elif isinstance(raw_confidence, float):
+        # Go through str() to keep 0.85 instead of its binary expansion
+        ocr_confidence = Decimal(str(raw_confidence))
+    else:
+        ocr_confidence = Decimal(raw_confidence)
+    return amount, amount_primary, exchange_rate, ocr_confidence
+
+
+def _load_tx_date(data: dict) -> datetime:
+    """Parse transaction_date from FSM data: a timestamp, or an ISO string written by older versions"""
+    raw_date = data['transaction_date']
+    if isinstance(raw_date, str):
+        return datetime.fromisoformat(raw_date)
+    return datetime.fromtimestamp(raw_date)
+
+
+async def _persist_and_reply(
+    session,
+    user: User,
+    data: dict,
+    amounts: Tuple[Decimal, Decimal, Decimal, Decimal],
+    category: Optional[Category],
+    transaction_date: datetime,
+    locale: str,
+    respond: Callable[[str], Awaitable[Any]],
+    description: Optional[str] = None
+) -> None:
+    """Save the receipt transaction from FSM data and reply with today's total"""
+    amount, amount_primary, exchange_rate, ocr_confidence = amounts
+    
+    _, today_total = await transaction_service.create_and_get_today(
+        session=session,
+        user_id=user.id,
+        amount=amount,
+        currency=data['currency'],
+        category_id=category.id if category else data['category_id'],
+        description=description,
+        merchant=data.get('merchant'),
+        transaction_date=transaction_date,
+        amount_primary=amount_primary,
+        exchange_rate=exchange_rate,
+        company_id=user.active_company_id,
+        receipt_image_url=data.get('receipt_image_url'),  # Use S3 URL from state
+        ocr_confidence=ocr_confidence
+    )
+    await session.commit()
+    
+    # Format response
+    amount_formatted = expense_parser.format_amount(amount, data['currency'])
+    today_formatted = expense_parser.format_amount(today_total, user.primary_currency)
+    
+    response = f"✅ {i18n.get('receipt.saved', locale)} {amount_formatted}"
+    if category:
+        response += f" → {category.icon} {category.get_name(locale)}"
+    
+    if data.get('merchant'):
+        response += f" ({data['merchant']})"
+    
+    if description:
+        response += f"\n📝 {description}"
+    
+    response += f"\n\n📊 {i18n.get('manual_input.today_spent', locale)}: {today_formatted}"
+    
+    await respond(response)
+
+
 @router.message(F.photo)
 async def process_receipt_photo(message: Message, state: FSMContext):
     """Process photo of receipt"""
     telegram_id = message.from_user.id
     caption = message.caption or ""
-    logger.info(f"[PHOTO HANDLER] Received photo from user {telegram_id}")
-    logger.info(f"[PHOTO HANDLER] Photo count: {len(message.photo)}, File ID: {message.photo[-1].file_id if message.photo else 'None'}")
-    logger.info(f"[PHOTO HANDLER] Caption: {caption}")
+    logger.debug("[PHOTO HANDLER] Received photo from user %s, caption: %s", telegram_id, caption)
     
     # Check if already processing
     current_state = await state.get_state()
     if current_state:
-        logger.info(f"[PHOTO HANDLER] User {telegram_id} is already in state: {current_state}")
+        logger.debug("[PHOTO HANDLER] User %s is already in state: %s", telegram_id, current_state)
         await message.answer("⏳ Пожалуйста, дождитесь завершения обработки предыдущего действия.")
         return
     
@@ -106,12 +232,12 @@ async def process_receipt_photo(message: Message, state: FSMContext):
         
         # Try to process with caption only
         if caption_data['amount']:
-            logger.info(f"[PHOTO HANDLER] OCR disabled, using caption data")
+            logger.debug("[PHOTO HANDLER] OCR disabled, using caption data")
             await state.update_data(
                 amount=str(caption_data['amount']),
                 currency=caption_data['currency'] or user.primary_currency,
                 merchant=None,
-                transaction_date=datetime.now().isoformat(),
+                transaction_date=datetime.now().timestamp(),
                 ocr_confidence=1.0,
                 user_currency=user.primary_currency,
                 photo_file_id=message.photo[-1].file_id,
@@ -121,7 +247,6 @@ async def process_receipt_photo(message: Message, state: FSMContext):
             )
             
             # Show category selection
-            await processing_msg.delete()
             await state.set_state(ReceiptStates.choosing_category)
             
             amount_formatted = expense_parser.format_amount(
@@ -137,7 +262,7 @@ async def process_receipt_photo(message: Message, state: FSMContext):
             )
             return
         else:
-            logger.info(f"[PHOTO HANDLER] OCR disabled and no amount in caption, asking for amount")
+            logger.debug("[PHOTO HANDLER] OCR disabled and no amount in caption, asking for amount")
             # Save photo file ID and ask for amount
             await state.update_data(
                 photo_file_id=message.photo[-1].file_id,
@@ -152,27 +277,25 @@ async def process_receipt_photo(message: Message, state: FSMContext):
             )
             return
     
-    logger.info(f"[PHOTO HANDLER] OCR is enabled, proceeding with processing")
+    logger.debug("[PHOTO HANDLER] OCR is enabled, proceeding with processing")
     
-    # Send processing message
-    processing_msg = await message.answer(
-        i18n.get("receipt.processing", locale)
-    )
+    # Get the largest photo
+    photo: PhotoSize = message.photo[-1]
     
-    await state.set_state(ReceiptStates.processing_image)
+    # Check file size
+    if photo.file_size > settings.max_image_size_bytes:
+        await message.answer(
+            i18n.get_error("image_too_large", locale, max_size=settings.max_image_size_mb)
+        )
+        await state.clear()
+        return
+    
+    # Send processing message while the photo is downloaded and recognized
+    processing_task = asyncio.create_task(
+        message.answer(i18n.get("receipt.processing", locale))
+    )
     
     try:
-        # Get the largest photo
-        photo: PhotoSize = message.photo[-1]
-        
-        # Check file size
-        if photo.file_size > settings.max_image_size_bytes:
-            await processing_msg.edit_text(
-                i18n.get_error("image_too_large", locale, max_size=settings.max_image_size_mb)
-            )
-            await state.clear()
-            return
-        
         # Download photo
         bot = message.bot
         file = await bot.get_file(photo.file_id)
@@ -204,9 +327,13 @@ async def process_receipt_photo(message: Message, state: FSMContext):
         caption_data = caption_parser.parse(caption)
         
         # Process with OCR
-        logger.info(f"[PHOTO HANDLER] Starting OCR processing for {photo.file_size} bytes")
-        ocr_result = await ocr_service.process_receipt(photo_bytes.getvalue())
-        logger.info(f"[PHOTO HANDLER] OCR result: {ocr_result}")
+        logger.debug("[PHOTO HANDLER] Starting OCR processing for %s bytes", photo.file_size)
+        ocr_result, processing_msg = await asyncio.gather(
+            ocr_service.process_receipt(photo_bytes.getvalue()),
+            processing_task
+        )
+        if logger.isEnabledFor(logging.DEBUG):
+            logger.debug("[PHOTO HANDLER] OCR result: %s", ocr_result)
         
         # Merge caption data with OCR result
         if caption_data['amount'] and not ocr_result.get('amount'):
@@ -248,7 +375,7 @@ async def process_receipt_photo(message: Message, state: FSMContext):
             amount=str(ocr_result['amount']) if ocr_result.get('amount') else None,
             currency=ocr_result.get('currency', user.primary_currency),
             merchant=ocr_result.get('merchant'),
-            transaction_date=transaction_date.isoformat(),
+            transaction_date=transaction_date.timestamp(),
             ocr_confidence=ocr_result.get('confidence', 0),
             user_currency=user.primary_currency,
             photo_file_id=photo.file_id,
@@ -305,12 +432,14 @@ async def process_receipt_photo(message: Message, state: FSMContext):
             ocr_result.get('currency', user.primary_currency)
         )
         
-        receipt_info = f"{i18n.get('receipt.found', locale)}\n"
-        receipt_info += f"{i18n.get('receipt.amount', locale)}: {amount_formatted}\n"
-        receipt_info += f"{i18n.get('receipt.date', locale)}: {ocr_result.get('date', datetime.now()).strftime('%d.%m.%Y')}\n"
+        template_locale = locale if locale in _RECEIPT_TEMPLATES else settings.default_language
+        receipt_info = _RECEIPT_TEMPLATES[template_locale].format(
+            amount=amount_formatted,
+            date=ocr_result.get('date', datetime.now()).strftime('%d.%m.%Y')
+        )
         
         if ocr_result.get('merchant'):
-            receipt_info += f"{i18n.get('receipt.place', locale)}: {ocr_result['merchant']}\n"
+            receipt_info += _RECEIPT_PLACE_TEMPLATES[template_locale].format(merchant=ocr_result['merchant'])
         
         # Add confidence warning if low
         if ocr_result.get('confidence', 1) < 0.7:
@@ -319,10 +448,10 @@ async def process_receipt_photo(message: Message, state: FSMContext):
         # Check if currency conversion needed
         detected_currency = ocr_result.get('currency', user.primary_currency)
         if detected_currency != user.primary_currency:
-            logger.info(f"[CURRENCY] Detected different currency: {detected_currency} (user currency: {user.primary_currency})")
+            logger.debug("[CURRENCY] Detected different currency: %s (user currency: %s)", detected_currency, user.primary_currency)
             
             if settings.enable_currency_conversion:
-                logger.info(f"[CURRENCY] Converting {ocr_result['amount']} {detected_currency} to {user.primary_currency}")
+                logger.debug("[CURRENCY] Converting %s %s to %s", ocr_result['amount'], detected_currency, user.primary_currency)
                 
                 # Get conversion rate
                 converted_amount, rate = await currency_service.convert_amount(
@@ -333,7 +462,10 @@ async def process_receipt_photo(message: Message, state: FSMContext):
                 )
                 
                 if converted_amount:
-                    logger.info(f"[CURRENCY] Conversion successful: {ocr_result['amount']} {detected_currency} = {converted_amount} {user.primary_currency} (rate: {rate})")
+                    logger.debug(
+                        "[CURRENCY] Conversion successful: %s %s = %s %s (rate: %s)",
+                        ocr_result['amount'], detected_currency, converted_amount, user.primary_currency, rate
+                    )
                     await state.update_data(
                         amount_primary=str(converted_amount),
                         exchange_rate=str(rate)
@@ -350,14 +482,14 @@ async def process_receipt_photo(message: Message, state: FSMContext):
                         exchange_rate='1.0000'
                     )
             else:
-                logger.info(f"[CURRENCY] Currency conversion disabled, will prompt user")
+                logger.debug("[CURRENCY] Currency conversion disabled, will prompt user")
                 # Don't set amount_primary here - let user choose
                 await state.update_data(
                     needs_currency_choice=True
                 )
         else:
             # Same currency, no conversion needed
-            logger.info(f"[CURRENCY] Same currency detected: {detected_currency}")
+            logger.debug("[CURRENCY] Same currency detected: %s", detected_currency)
             await state.update_data(
                 amount_primary=str(ocr_result['amount']),
                 exchange_rate='1.0000'
@@ -371,29 +503,18 @@ async def process_receipt_photo(message: Message, state: FSMContext):
             # Show currency selection first
             await processing_msg.edit_text(
                 receipt_info + f"\n{i18n.get('currency.save_question', locale)}",
-                reply_markup=get_currency_save_keyboard(locale)
+                reply_markup=get_currency_save_keyboard(locale),
+                parse_mode=None  # Receipt text is OCR output, not HTML
             )
             await state.set_state(ReceiptStates.selecting_currency)
             return
         
         # Auto-save transaction with detected category
         detected_category = ocr_result.get('category', 'other')
-        logger.info(f"Detected category: {detected_category}")
+        logger.debug("Detected category: %s", detected_category)
         
         # Map AI category to our default categories
-        category_mapping = {
-            'food': 'food',
-            'transport': 'transport',
-            'shopping': 'shopping',
-            'utilities': 'home',  # Mobile operators go to home/utilities
-            'health': 'health',
-            'entertainment': 'entertainment',
-            'donation': 'donation',
-            'other': 'other'
-        }
-        
-        category_key = category_mapping.get(detected_category, 'other')
-        logger.info(f"Mapped category key: {category_key}")
+        category_key = _CATEGORY_MAP.get(detected_category, 'other')
         
         # Check confidence for automatic saving
         ocr_confidence = ocr_result.get('confidence', 0)
@@ -402,7 +523,8 @@ async def process_receipt_photo(message: Message, state: FSMContext):
         if category_key == 'other':
             await processing_msg.edit_text(
                 receipt_info + f"\n\n{i18n.get('receipt.ask_description', locale)}\n{i18n.get('receipt.description_hint', locale)}",
-                reply_markup=get_cancel_keyboard(locale)
+                reply_markup=get_cancel_keyboard(locale),
+                parse_mode=None  # Receipt text is OCR output, not HTML
             )
             await state.set_state(ReceiptStates.asking_description)
             return
@@ -411,7 +533,8 @@ async def process_receipt_photo(message: Message, state: FSMContext):
         if ocr_confidence < 0.7:
             await processing_msg.edit_text(
                 receipt_info + f"\n{i18n.get('expense.choose_category', locale)}",
-                reply_markup=get_default_categories_keyboard(locale)
+                reply_markup=get_default_categories_keyboard(locale),
+                parse_mode=None  # Receipt text is OCR output, not HTML
             )
             await state.set_state(ReceiptStates.choosing_category)
             return
@@ -421,30 +544,28 @@ async def process_receipt_photo(message: Message, state: FSMContext):
         
         if not category:
             # Fallback to 'other' category
-            category = await category_service.get_default_category(session, user.id, 'other')
-            
-        if not category:
-            # Create default categories if they don't exist
-            await category_service.get_or_create_default_categories(session, user.id)
-            await session.commit()
+            other_id = _other_category_ids.get(user.id)
+            if other_id:
+                category = await session.get(Category, other_id)
+            if not category:
+                category = await category_service.get_default_category(session, user.id, 'other')
             
-            # Try again
-            category = await category_service.get_default_category(session, user.id, category_key)
             if not category:
+                # Recreate missing defaults (the user may still have custom categories) and commit,
+                # since the duplicate branch keeps the category id in state across updates
+                logger.error(f"[PHOTO HANDLER] User {user.id} has no default categories")
+                await category_service.create_default_categories(session, user.id)
+                await session.commit()
                 category = await category_service.get_default_category(session, user.id, 'other')
+            
+            _other_category_ids[user.id] = category.id
         
         # Get state data
         data = await state.get_data()
+        amounts = _load_tx_decimals(data)
+        amount = amounts[0]
         
-        # Parse transaction date for duplicate check
-        transaction_date = data.get('transaction_date')
-        if transaction_date:
-            try:
-                transaction_date = datetime.fromisoformat(transaction_date)
-            except:
-                transaction_date = datetime.now()
-        else:
-            transaction_date = datetime.now()
+        transaction_date = _load_tx_date(data)
         
         # Check if the date is too old (more than 30 days)
         days_difference = (datetime.now() - transaction_date).days
@@ -456,7 +577,7 @@ async def process_receipt_photo(message: Message, state: FSMContext):
         potential_duplicates = await duplicate_detector.find_duplicates(
             session=session,
             user_id=user.id,
-            amount=Decimal(data['amount']),
+            amount=amount,
             merchant=data.get('merchant'),
             transaction_date=transaction_date,
             time_window_hours=2  # Check within 2 hours window
@@ -479,79 +600,33 @@ async def process_receipt_photo(message: Message, state: FSMContext):
             # Save category_id to state for later use
             await state.update_data(category_id=category.id)
             
-            # Create confirmation keyboard
-            from aiogram.types import InlineKeyboardMarkup, InlineKeyboardButton
-            
-            yes_text = i18n.get("buttons.yes", locale)
-            no_text = i18n.get("buttons.no", locale)
-            logger.info(f"[DUPLICATE BUTTONS] Creating buttons with locale '{locale}': yes='{yes_text}', no='{no_text}'")
-            
-            keyboard = InlineKeyboardMarkup(inline_keyboard=[
-                [
-                    InlineKeyboardButton(
-                        text=yes_text,
-                        callback_data="confirm_duplicate_photo"
-                    ),
-                    InlineKeyboardButton(
-                        text=no_text,
-                        callback_data="cancel_duplicate_photo"
-                    )
-                ]
-            ])
+            # Use prebuilt confirmation keyboard
+            keyboard = _DUP_KEYBOARDS.get(locale, _DUP_KEYBOARDS[settings.default_language])
             
             await processing_msg.edit_text(duplicate_info, reply_markup=keyboard)
             await state.set_state(ReceiptStates.confirming_duplicate)
             return
         
-        # Create transaction immediately
-        amount_primary = Decimal(data.get('amount_primary', data['amount']))
-        exchange_rate = Decimal(data.get('exchange_rate', '1.0000'))
-        
-        # Check if user is in company mode
-        company_id = user.active_company_id if user else None
-        
-        transaction = await transaction_service.create_transaction(
-            session=session,
-            user_id=user.id,
-            amount=Decimal(data['amount']),
-            currency=data['currency'],
-            category_id=category.id,
-            merchant=data.get('merchant'),
-            transaction_date=transaction_date,
-            amount_primary=amount_primary,
-            exchange_rate=exchange_rate,
-            company_id=company_id,
-            receipt_image_url=data.get('receipt_image_url'),  # Use S3 URL from state
-            ocr_confidence=Decimal(str(data.get('ocr_confidence', 0)))
+        await _persist_and_reply(
+            session, user, data, amounts, category, transaction_date, locale,
+            processing_msg.edit_text
         )
-        
-        await session.commit()
-        
-        # Get today's spending
-        today_total, _ = await transaction_service.get_today_spending(session, user.id)
-        
-        # Format response
-        amount_formatted = expense_parser.format_amount(Decimal(data['amount']), data['currency'])
-        today_formatted = expense_parser.format_amount(today_total, user.primary_currency)
-        
-        response = f"✅ {i18n.get('receipt.saved', locale)} "
-        response += f"{amount_formatted} → {category.icon} {category.get_name(locale)}"
-        
-        if data.get('merchant'):
-            response += f" ({data['merchant']})"
-        
-        response += f"\n\n📊 {i18n.get('manual_input.today_spent', locale)}: {today_formatted}"
-        
-        await processing_msg.edit_text(response)
         await state.clear()
         
     except Exception as e:
         logger.error(f"[PHOTO HANDLER] Error processing receipt photo: {e}", exc_info=True)
-        await processing_msg.edit_text(
-            i18n.get("receipt.error_quality", locale),
-            reply_markup=get_cancel_keyboard(locale)
-        )
-        await state.clear()
+        error_text = i18n.get("receipt.error_quality", locale)
+        try:
+            try:
+                processing_msg = await processing_task
+            except Exception as send_error:
+                # The processing message itself was never sent, so there is nothing to edit
+                logger.error(f"[PHOTO HANDLER] Failed to send processing message: {send_error}")
+                await message.answer(error_text, reply_markup=get_cancel_keyboard(locale))
+            else:
+                await processing_msg.edit_text(error_text, reply_markup=get_cancel_keyboard(locale))
+        finally:
+            await state.clear()
 
 
 @router.callback_query(F.data.startswith("currency:"), StateFilter(ReceiptStates.selecting_currency))
@@ -657,54 +732,12 @@ async def process_receipt_category(callback: CallbackQuery, state: FSMContext):
         # Get state data
         data = await state.get_data()
         
-        # Get receipt image URL from state (uploaded earlier in OCR processing)
-        receipt_image_url = data.get('receipt_image_url')
-        
-        # Create transaction
-        amount_primary = Decimal(data.get('amount_primary', data['amount']))
-        exchange_rate = Decimal(data.get('exchange_rate', '1.0000'))
+        transaction_date = _load_tx_date(data)
         
-        # Parse transaction date
-        transaction_date = data['transaction_date']
-        if isinstance(transaction_date, str):
-            try:
-                transaction_date = datetime.fromisoformat(transaction_date)
-            except:
-                transaction_date = datetime.now()
-        
-        transaction = await transaction_service.create_transaction(
-            session=session,
-            user_id=user.id,
-            amount=Decimal(data['amount']),
-            currency=data['currency'],
-            category_id=category.id,
-            merchant=data.get('merchant'),
-            transaction_date=transaction_date,
-            amount_primary=amount_primary,
-            exchange_rate=exchange_rate,
-            company_id=user.active_company_id,  # Add company_id support
-            receipt_image_url=receipt_image_url,
-            ocr_confidence=Decimal(str(data.get('ocr_confidence', 0)))
+        await _persist_and_reply(
+            session, user, data, _load_tx_decimals(data), category, transaction_date, locale,
+            callback.message.edit_text
         )
-        
-        await session.commit()
-        
-        # Get today's spending
-        today_total, _ = await transaction_service.get_today_spending(session, user.id)
-        
-        # Format response
-        amount_formatted = expense_parser.format_amount(Decimal(data['amount']), data['currency'])
-        today_formatted = expense_parser.format_amount(today_total, user.primary_currency)
-        
-        response = f"{i18n.get('receipt.saved', locale)} "
-        response += f"{amount_formatted} {i18n.get(f'categories.{category_key}', locale)}"
-        
-        if data.get('merchant'):
-            response += f" ({data['merchant']})"
-        
-        response += f"\n\n{i18n.get('manual_input.today_spent', locale)}: {today_formatted}"
-        
-        await callback.message.edit_text(response)
         await state.clear()
 
 
@@ -718,51 +751,13 @@ async def confirm_duplicate_photo(callback: CallbackQuery, state: FSMContext):
         user = await user_service.get_user_by_telegram_id(session, telegram_id)
         locale = user.language_code
         
-        # Parse transaction date
-        transaction_date = data['transaction_date']
-        if isinstance(transaction_date, str):
-            try:
-                transaction_date = datetime.fromisoformat(transaction_date)
-            except:
-                transaction_date = datetime.now()
-        
-        # Create transaction
-        amount_primary = Decimal(data.get('amount_primary', data['amount']))
-        exchange_rate = Decimal(data.get('exchange_rate', '1.0000'))
+        transaction_date = _load_tx_date(data)
         
-        transaction = await transaction_service.create_transaction(
-            session=session,
-            user_id=user.id,
-            amount=Decimal(data['amount']),
-            currency=data['currency'],
-            category_id=data['category_id'],
-            merchant=data.get('merchant'),
-            transaction_date=transaction_date,
-            amount_primary=amount_primary,
-            exchange_rate=exchange_rate,
-            company_id=user.active_company_id,  # Add company_id support
-            receipt_image_url=data.get('receipt_image_url'),  # Use S3 URL from state
-            ocr_confidence=Decimal(str(data.get('ocr_confidence', 0)))
+        # Category id was stored in state before asking for confirmation
+        await _persist_and_reply(
+            session, user, data, _load_tx_decimals(data), None, transaction_date, locale,
+            callback.message.edit_text
         )
-        
-        await session.commit()
-        
-        # Get today's spending
-        today_total, _ = await transaction_service.get_today_spending(session, user.id)
-        
-        # Format response
-        amount_formatted = expense_parser.format_amount(Decimal(data['amount']), data['currency'])
-        today_formatted = expense_parser.format_amount(today_total, user.primary_currency)
-        
-        response = f"✅ {i18n.get('receipt.saved', locale)} "
-        response += f"{amount_formatted}"
-        
-        if data.get('merchant'):
-            response += f" ({data['merchant']})"
-        
-        response += f"\n\n📊 {i18n.get('manual_input.today_spent', locale)}: {today_formatted}"
-        
-        await callback.message.edit_text(response)
         await state.clear()
 
 
@@ -897,7 +892,7 @@ async def process_manual_amount_input(message: Message, state: FSMContext):
             
             if category_obj:
                 # Create transaction immediately
-                transaction = await transaction_service.create_transaction(
+                _, today_total = await transaction_service.create_and_get_today(
                     session=session,
                     user_id=user.id,
                     amount=amount,
@@ -906,17 +901,13 @@ async def process_manual_amount_input(message: Message, state: FSMContext):
                     description=description,
                     transaction_date=datetime.now(),
                     amount_primary=amount,
-                    exchange_rate=Decimal('1.0000'),
+                    exchange_rate=_D_ONE,
                     company_id=user.active_company_id,  # Add company_id support
                     receipt_image_url=data.get('receipt_image_url'),  # Use S3 URL from state
-                    ocr_confidence=Decimal('1.0')
+                    ocr_confidence=_D_ONE
                 )
-                
                 await session.commit()
                 
-                # Get today's spending
-                today_total, _ = await transaction_service.get_today_spending(session, user.id)
-                
                 # Format response
                 today_formatted = expense_parser.format_amount(today_total, user.primary_currency)
                 
@@ -1001,21 +992,16 @@ async def process_description_request(message: Message, state: FSMContext):
             category = await category_service.get_default_category(session, user.id, category_key)
             
             if category:
-                # Parse transaction date for duplicate check
-                transaction_date = data.get('transaction_date')
-                if transaction_date:
-                    try:
-                        transaction_date = datetime.fromisoformat(transaction_date)
-                    except:
-                        transaction_date = datetime.now()
-                else:
-                    transaction_date = datetime.now()
+                amounts = _load_tx_decimals(data)
+                amount = amounts[0]
+                
+                transaction_date = _load_tx_date(data)
                 
                 # Check for duplicates using exact transaction date/time
                 potential_duplicates = await duplicate_detector.find_duplicates(
                     session=session,
                     user_id=user.id,
-                    amount=Decimal(data['amount']),
+                    amount=amount,
                     merchant=data.get('merchant'),
                     transaction_date=transaction_date,
                     time_window_hours=2  # Check within 2 hours window
@@ -1044,55 +1030,10 @@ async def process_description_request(message: Message, state: FSMContext):
                     await state.clear()
                     return
                 
-                # Parse original transaction date for saving
-                transaction_date = data.get('transaction_date')
-                if transaction_date:
-                    try:
-                        transaction_date = datetime.fromisoformat(transaction_date)
-                    except:
-                        transaction_date = datetime.now()
-                else:
-                    transaction_date = datetime.now()
-                
-                # Create transaction
-                amount_primary = Decimal(data.get('amount_primary', data['amount']))
-                exchange_rate = Decimal(data.get('exchange_rate', '1.0000'))
-                
-                transaction = await transaction_service.create_transaction(
-                    session=session,
-                    user_id=user.id,
-                    amount=Decimal(data['amount']),
-                    currency=data['currency'],
-                    category_id=category.id,
-                    description=description,
-                    merchant=data.get('merchant'),
-                    transaction_date=transaction_date,
-                    amount_primary=amount_primary,
-                    exchange_rate=exchange_rate,
-                    company_id=user.active_company_id,  # Add company_id support
-                    receipt_image_url=data.get('receipt_image_url'),  # Use S3 URL from state
-                    ocr_confidence=Decimal(str(data.get('ocr_confidence', 0)))
+                await _persist_and_reply(
+                    session, user, data, amounts, category, transaction_date, locale,
+                    message.answer, description=description
                 )
-                
-                await session.commit()
-                
-                # Get today's spending
-                today_total, _ = await transaction_service.get_today_spending(session, user.id)
-                
-                # Format response
-                amount_formatted = expense_parser.format_amount(Decimal(data['amount']), data['currency'])
-                today_formatted = expense_parser.format_amount(today_total, user.primary_currency)
-                
-                response = f"✅ {i18n.get('receipt.saved', locale)} "
-                response += f"{amount_formatted} → {category.icon} {category.get_name(locale)}"
-                
-                if data.get('merchant'):
-                    response += f" ({data['merchant']})"
-                
-                response += f"\n📝 {description}"
-                response += f"\n\n📊 {i18n.get('manual_input.today_spent', locale)}: {today_formatted}"
-                
-                await message.answer(response)
                 await state.clear()
                 return
         
@@ -1,21 +1,34 @@
 import io
+import asyncio
+import hashlib
 import logging
-from datetime import datetime, date, timedelta
-from typing import List, Tuple, Optional
-import matplotlib.pyplot as plt
+import threading
+from heapq import nlargest
+from operator import itemgetter
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from datetime import datetime, date, time, timedelta
+from typing import Dict, List, NamedTuple, Tuple, Optional, Union
+import numpy as np
+import matplotlib
+matplotlib.use("Agg")  # Headless: no GUI backend probe; charts never touch pyplot
 import matplotlib.dates as mdates
-from matplotlib.font_manager import FontProperties
-import seaborn as sns
+import matplotlib.style
+from matplotlib.figure import Figure
+from matplotlib.backends.backend_agg import FigureCanvasAgg
+from PIL import Image
 from aiogram import Router, F
-from aiogram.types import Message, BufferedInputFile
-from sqlalchemy import select, func, and_
+from aiogram.types import Message, BufferedInputFile, InputMediaPhoto
+from cachetools import LRUCache, TTLCache
+from sqlalchemy import select, func, and_, extract, type_coerce, Float
 from sqlalchemy.ext.asyncio import AsyncSession
-from sqlalchemy.orm import joinedload
 
+from src.core.config import settings
 from src.database import get_session
-from src.database.models import Transaction, Category, User, CompanyTransaction, CompanyCategory
+from src.database.models import Transaction, Category, User, CompanyTransaction
 from src.services.user import UserService
 from src.services.transaction import TransactionService
+from src.services.report_cache import report_cache
 from src.utils.i18n import i18n
 from src.utils.text_parser import ExpenseParser
 
@@ -25,178 +38,527 @@ user_service = UserService()
 transaction_service = TransactionService()
 expense_parser = ExpenseParser()
 
-# Set style for charts
-plt.style.use('seaborn-v0_8-darkgrid')
-sns.set_palette("husl")
+# Amounts are DECIMAL in the database but only ever summed and plotted as floats here;
+# coercing the result type converts them in SQLAlchemy's (C) result processors
+# instead of a float(Decimal) call per row in report code
+_amount_primary = type_coerce(Transaction.amount_primary, Float)
+_amount_total = type_coerce(func.sum(Transaction.amount_primary), Float)
 
+# Below this many categories a chart adds nothing over text bars in the report itself
+_MIN_CHART_CATEGORIES = 5
 
-async def get_period_data(
+# Pie slices beyond this are folded into a single "Other" slice, they'd be unreadable anyway
+_PIE_MAX_SLICES = 8
+
+# Above this many bars/points only the peak (and latest) value is labelled, one Text artist each
+_MAX_POINT_LABELS = 20
+
+# Charts are sized in inches, so 100 dpi keeps them at 1000-1200px wide (set on the figure itself)
+_CHART_DPI = 100
+
+# Fixed margins per chart kind instead of tight_layout's solver on every render; set once
+# when a pooled figure is created, Axes.clear() leaves them in place
+_CHART_LAYOUT = {
+    'daily': dict(left=0.10, right=0.98, top=0.92, bottom=0.18),
+    'monthly': dict(left=0.09, right=0.98, top=0.92, bottom=0.16),
+    'pie': dict(left=0.05, right=0.95, top=0.90, bottom=0.05),
+    'bar': dict(left=0.30, right=0.85, top=0.93, bottom=0.08),
+    'trend': dict(left=0.09, right=0.98, top=0.95, bottom=0.09, hspace=0.45),
+}
+
+# Summary block of the all-time report, filled in with a single format call
+_ALL_TIME_SUMMARY = (
+    "📅 {first} - {last}\n\n"
+    "💰 <b>Общая сумма</b>: {total}\n"
+    "📝 <b>Транзакций</b>: {count}\n"
+    "📊 <b>Среднее в день</b>: {avg_daily}\n"
+    "📈 <b>Активных месяцев</b>: {months}\n\n"
+)
+
+# Rendered PNGs keyed by chart type, its inputs and labels; charts are pure functions of these.
+# Bounded by total PNG size, and an entry is dropped once the chart's file_id is known
+_chart_cache = LRUCache(maxsize=64 * 1024 * 1024, getsizeof=len)
+
+# Telegram file_id of charts already uploaded, by the same key; resending by file_id skips
+# both the render and the upload. Kept for a day, file_ids themselves do not expire
+_chart_file_ids = TTLCache(maxsize=4096, ttl=86400)
+
+
+class _ChartStrings(NamedTuple):
+    """Static chart labels for one locale"""
+    date: str
+    amount: str
+    average: str
+    expenses_by_category: str
+    daily_amount: str
+    daily_trend: str
+    cumulative_amount: str
+    cumulative_trend: str
+
+
+# Resolved once per locale at import instead of several i18n lookups per render
+_CHART_STRINGS = {
+    locale: _ChartStrings(*(i18n.get(f'stats.{field}', locale) for field in _ChartStrings._fields))
+    for locale in i18n.translations
+}
+
+
+def _chart_strings(locale: str) -> _ChartStrings:
+    """Chart labels for locale, falling back to Russian like i18n.get"""
+    return _CHART_STRINGS.get(locale) or _CHART_STRINGS['ru']
+
+
+def _chart_cache_key(kind: str, items: list, *labels) -> tuple:
+    """Build a compact cache key for a chart"""
+    return (kind, hashlib.blake2b(repr(items).encode(), digest_size=16).digest(), *labels)
+
+
+def _filter_period(
+    query,
+    user_id: int,
+    start_date: Optional[date],
+    end_date: Optional[date],
+    company_id: Optional[str] = None
+):
+    """Restrict a query to personal or approved company transactions within the period
+    
+    A None bound leaves that side of the period open, so all-time queries carry no date predicate.
+    """
+    conditions = [Transaction.is_deleted == False]
+    
+    # Convert dates to datetime to include full day range
+    if start_date is not None:
+        conditions.append(Transaction.transaction_date >= datetime.combine(start_date, time.min))  # 00:00:00
+    if end_date is not None:
+        conditions.append(Transaction.transaction_date <= datetime.combine(end_date, time.max))    # 23:59:59.999999
+    
+    if company_id:
+        # Company transactions
+        return query.join(
+            CompanyTransaction,
+            CompanyTransaction.transaction_id == Transaction.id
+        ).where(
+            and_(
+                CompanyTransaction.company_id == company_id,
+                CompanyTransaction.status == 'approved',
+                *conditions
+            )
+        )
+    
+    # Personal transactions only
+    return query.where(
+        and_(
+            Transaction.user_id == user_id,
+            Transaction.company_id == None,
+            *conditions
+        )
+    )
+
+
+async def count_transactions(
+    session: AsyncSession,
+    user_id: int,
+    start_date: Optional[date],
+    end_date: Optional[date],
+    company_id: Optional[str] = None
+) -> int:
+    """Count transactions for period without loading them"""
+    try:
+        query = select(func.count(Transaction.id)).select_from(Transaction)
+        query = _filter_period(query, user_id, start_date, end_date, company_id)
+        return await session.scalar(query) or 0
+    except Exception as e:
+        logger.error(f"Error counting transactions: {e}")
+        return 0
+
+
+async def get_daily_totals(
+    session: AsyncSession,
+    user_id: int,
+    start_date: Optional[date],
+    end_date: Optional[date],
+    company_id: Optional[str] = None
+) -> List[Tuple[date, float]]:
+    """Get (day, total) pairs for period, aggregated in the database"""
+    try:
+        day = func.date(Transaction.transaction_date).label('day')
+        query = select(day, _amount_total).select_from(Transaction)
+        query = _filter_period(query, user_id, start_date, end_date, company_id)
+        result = await session.execute(query.group_by(day).order_by(day))
+        
+        # SQLite returns DATE() as an ISO string, MySQL as a date
+        return [
+            (d if isinstance(d, date) else date.fromisoformat(d), total)
+            for d, total in result.all()
+        ]
+    except Exception as e:
+        logger.error(f"Error getting daily totals: {e}")
+        return []
+
+
+async def get_monthly_totals(
+    session: AsyncSession,
+    user_id: int,
+    start_date: Optional[date],
+    end_date: Optional[date],
+    company_id: Optional[str] = None
+) -> list:
+    """Get per-month (first day of month, total, count, first, last) rows for period, oldest first"""
+    try:
+        year = extract('year', Transaction.transaction_date).label('year')
+        month = extract('month', Transaction.transaction_date).label('month')
+        query = select(
+            year,
+            month,
+            _amount_total.label('total'),
+            func.count(Transaction.id).label('count'),
+            func.min(Transaction.transaction_date).label('first'),
+            func.max(Transaction.transaction_date).label('last')
+        ).select_from(Transaction)
+        query = _filter_period(query, user_id, start_date, end_date, company_id)
+        result = await session.execute(query.group_by(year, month).order_by(year, month))
+        return [
+            (date(int(row.year), int(row.month), 1), row.total, row.count, row.first, row.last)
+            for row in result.all()
+        ]
+    except Exception as e:
+        logger.error(f"Error getting monthly totals: {e}")
+        return []
+
+
+async def get_category_totals(
+    session: AsyncSession,
+    user_id: int,
+    start_date: Optional[date],
+    end_date: Optional[date],
+    company_id: Optional[str] = None
+) -> list:
+    """Get per-category (id, icon, name_ru, name_kz, total, count) rows for period, largest first
+    
+    Uncategorized transactions are returned as a single row with id None.
+    """
+    try:
+        query = select(
+            Category.id,
+            Category.icon,
+            Category.name_ru,
+            Category.name_kz,
+            _amount_total.label('total'),
+            func.count(Transaction.id).label('count')
+        ).select_from(Transaction).outerjoin(Category, Transaction.category_id == Category.id)
+        query = _filter_period(query, user_id, start_date, end_date, company_id)
+        query = query.group_by(Category.id).order_by(func.sum(Transaction.amount_primary).desc())
+        result = await session.execute(query)
+        return result.all()
+    except Exception as e:
+        logger.error(f"Error getting category totals: {e}")
+        return []
+
+
+async def get_period_aggregates(
     session: AsyncSession,
     user_id: int,
     start_date: date,
     end_date: date,
     company_id: Optional[str] = None
-) -> List[Transaction]:
-    """Get transactions for period"""
+) -> Tuple[list, List[Tuple[date, float]]]:
+    """Get category totals and daily totals for period concurrently"""
+    # A session can't run two statements at once, so the daily query gets its own connection
+    async with get_session() as daily_session:
+        category_stats, daily_totals = await asyncio.gather(
+            get_category_totals(session, user_id, start_date, end_date, company_id),
+            get_daily_totals(daily_session, user_id, start_date, end_date, company_id)
+        )
+    return category_stats, daily_totals
+
+
+def _category_items(category_stats: list, locale: str) -> List[Tuple[str, float]]:
+    """Turn category total rows into ("icon name", amount) pairs, skipping uncategorized"""
+    return [
+        (f"{stat.icon} {stat.name_ru if locale == 'ru' else stat.name_kz}", stat.total)
+        for stat in category_stats
+        if stat.id is not None
+    ]
+
+
+_render_pool: Optional[ProcessPoolExecutor] = None
+
+
+def _init_render_worker():
+    """Warm up a render process: apply the style and draw once so font caches are loaded"""
+    _ensure_style()
+    fig = Figure()
+    FigureCanvasAgg(fig)
+    fig.subplots().set_title('warmup')
+    fig.canvas.draw()
+
+
+def _get_render_pool() -> ProcessPoolExecutor:
+    """Get (lazily create) the process pool for chart rendering"""
+    global _render_pool
+    if _render_pool is None:
+        _render_pool = ProcessPoolExecutor(
+            max_workers=settings.chart_render_workers,
+            initializer=_init_render_worker
+        )
+    return _render_pool
+
+
+async def _render_off_loop(render, *args) -> bytes:
+    """Run a render function in the process pool, falling back to a thread if the pool died"""
+    global _render_pool
+    pool = _get_render_pool()
     try:
-        # Convert dates to datetime to include full day range
-        from datetime import datetime, time
-        start_datetime = datetime.combine(start_date, time.min)  # 00:00:00
-        end_datetime = datetime.combine(end_date, time.max)      # 23:59:59.999999
-        
-        query = select(Transaction).options(joinedload(Transaction.category))
-        
-        if company_id:
-            # Company transactions
-            logger.info(f"[GET_PERIOD_DATA] Company mode: {company_id}, dates: {start_date} to {end_date}")
-            query = query.join(
-                CompanyTransaction,
-                CompanyTransaction.transaction_id == Transaction.id
-            ).where(
-                and_(
-                    CompanyTransaction.company_id == company_id,
-                    CompanyTransaction.status == 'approved',
-                    Transaction.transaction_date >= start_datetime,
-                    Transaction.transaction_date <= end_datetime,
-                    Transaction.is_deleted == False
-                )
-            )
-        else:
-            # Personal transactions only
-            logger.info(f"[GET_PERIOD_DATA] Personal mode for user {user_id}, dates: {start_date} to {end_date}")
-            query = query.where(
-                and_(
-                    Transaction.user_id == user_id,
-                    Transaction.company_id == None,
-                    Transaction.transaction_date >= start_datetime,
-                    Transaction.transaction_date <= end_datetime,
-                    Transaction.is_deleted == False
-                )
-            )
+        return await asyncio.get_running_loop().run_in_executor(pool, render, *args)
+    except BrokenProcessPool:
+        # A worker crashed (e.g. OOM): recreate the pool next time, still answer this request
+        logger.warning("Chart render pool is broken, rendering in a thread")
+        pool.shutdown(wait=False)
+        # Concurrent renders on the same dead pool must not discard a pool another one already replaced
+        if _render_pool is pool:
+            _render_pool = None
+        return await asyncio.to_thread(render, *args)
+
+
+class _Chart(NamedTuple):
+    """A chart ready to send: Telegram file_id if it was uploaded before, PNG bytes otherwise"""
+    key: tuple
+    media: Union[str, bytes]
+
+
+async def _render_cached(cache_key: tuple, render, *args) -> _Chart:
+    """Return the uploaded file_id or cached PNG for the chart, rendering it in a worker process if needed
+    
+    Render functions take only picklable arguments (lists of tuples, strings) and return PNG bytes.
+    """
+    file_id = _chart_file_ids.get(cache_key)
+    if file_id is not None:
+        return _Chart(cache_key, file_id)
+    
+    png = _chart_cache.get(cache_key)
+    if png is None:
+        png = await _render_off_loop(render, *args)
+        _chart_cache[cache_key] = png
+    return _Chart(cache_key, png)
+
+
+class _FigurePool:
+    """Idle figures per chart kind and shape, reused across renders
+    
+    Building a Figure with its Agg canvas and axes costs more than clearing and
+    redrawing an existing one. Figures are leased to a single render at a time
+    and never shared between chart kinds, so state that Axes.clear() keeps (e.g. the
+    pie's frame and aspect) cannot leak into another chart.
+    """
+    
+    def __init__(self, max_idle: int = 4):
+        self._lock = threading.Lock()
+        self._max_idle = max_idle
+        self._idle: Dict[tuple, List[Figure]] = {}
+        self._leased: Dict[int, tuple] = {}
+    
+    def acquire(self, kind: str, nrows: int, ncols: int, figsize: Tuple[float, float]) -> Figure:
+        key = (kind, nrows, ncols, figsize)
+        with self._lock:
+            idle = self._idle.get(key)
+            fig = idle.pop() if idle else None
         
-        query = query.order_by(Transaction.transaction_date)
-        result = await session.execute(query)
-        transactions = result.scalars().all()
+        if fig is None:
+            # Style is read from rcParams when the figure and axes are created
+            _ensure_style()
+            # Own Agg canvas, bypassing pyplot's global (non thread-safe) state
+            fig = Figure(figsize=figsize, dpi=_CHART_DPI)
+            FigureCanvasAgg(fig)
+            fig.subplots(nrows, ncols)
+            fig.subplots_adjust(**_CHART_LAYOUT[kind])
+        
+        with self._lock:
+            self._leased[id(fig)] = key
+        return fig
+    
+    def release(self, fig: Figure):
+        with self._lock:
+            key = self._leased.pop(id(fig), None)
+        if key is None:
+            return
         
-        logger.info(f"[GET_PERIOD_DATA] Found {len(transactions)} transactions")
-        for t in transactions[:3]:  # Log first 3 transactions
-            logger.info(f"[GET_PERIOD_DATA] Transaction: {t.amount} {t.currency} on {t.transaction_date} company_id={t.company_id}")
+        # Clear on the way back so idle figures don't keep the last chart's artists
+        # (ticks, texts, patches) alive; a figure that isn't pooled is cleared to break
+        # its reference cycles before it is dropped
+        for ax in fig.axes:
+            ax.clear()
         
-        return transactions
-    except Exception as e:
-        logger.error(f"Error getting period data: {e}")
-        # Return empty list on error to prevent crashes
-        return []
+        with self._lock:
+            idle = self._idle.setdefault(key, [])
+            if len(idle) < self._max_idle:
+                idle.append(fig)
+                return
+        fig.clear()
 
 
-async def generate_daily_chart(
-    transactions: List[Transaction],
+_figure_pool = _FigurePool()
+_style_lock = threading.Lock()
+_style_applied = False
+
+
+def _ensure_style():
+    """Apply the chart style on first render instead of at import"""
+    global _style_applied
+    if _style_applied:
+        return
+    with _style_lock:
+        if not _style_applied:
+            matplotlib.style.use('seaborn-v0_8-darkgrid')
+            _style_applied = True
+
+
+def _palette(n: int):
+    """n evenly spaced hues, matplotlib-only replacement for seaborn's husl palette"""
+    return matplotlib.colormaps['hsv'](np.linspace(0, 1, n, endpoint=False))
+
+
+def _new_figure(kind: str, nrows: int = 1, ncols: int = 1, figsize: Tuple[float, float] = (10, 6)):
+    """Lease a pooled figure; it goes back to the pool in _figure_to_png"""
+    fig = _figure_pool.acquire(kind, nrows, ncols, figsize)
+    axes = fig.axes
+    return fig, axes[0] if len(axes) == 1 else tuple(axes)
+
+
+def _figure_to_png(fig: Figure) -> bytes:
+    """Render figure to PNG bytes and return it to the pool"""
+    # Draw once on the Agg canvas and let Pillow encode its RGBA buffer directly,
+    # skipping savefig's bbox/backend dispatch. Telegram recompresses photos anyway,
+    # so favour encode speed over PNG size
+    try:
+        fig.canvas.draw()
+        image = Image.frombuffer(
+            'RGBA', fig.canvas.get_width_height(), fig.canvas.buffer_rgba(), 'raw', 'RGBA', 0, 1
+        )
+        buffer = io.BytesIO()
+        image.save(buffer, format='PNG', compress_level=1)
+        return buffer.getvalue()
+    finally:
+        _figure_pool.release(fig)
+
+
+def _fill_days(daily_totals: List[Tuple[date, float]]) -> Tuple[np.ndarray, np.ndarray]:
+    """Spread (day, total) pairs over a continuous day range, missing days stay 0"""
+    if not daily_totals:
+        return np.array([], dtype='datetime64[D]'), np.zeros(0)
+    
+    day_list, total_list = zip(*daily_totals)
+    days = np.array(day_list, dtype='datetime64[D]')
+    first_day = days.min()
+    dates = np.arange(first_day, days.max() + 1)
+    amounts = np.zeros(len(dates))
+    amounts[(days - first_day).astype(np.int64)] = np.fromiter(total_list, dtype=np.float64, count=len(total_list))
+    return dates, amounts
+
+
+def _set_date_axis(ax, days: int):
+    """Daily ticks for short periods, weekly or monthly ones for longer, fewer Tick artists to draw"""
+    if days <= 14:
+        locator, fmt = mdates.DayLocator(), '%d.%m'
+    elif days <= 60:
+        locator, fmt = mdates.WeekdayLocator(byweekday=mdates.MO), '%d.%m'
+    else:
+        locator, fmt = mdates.MonthLocator(), '%m.%y'
+    ax.xaxis.set_major_locator(locator)
+    ax.xaxis.set_major_formatter(mdates.DateFormatter(fmt))
+
+
+def _render_daily_chart(
+    daily_totals: List[Tuple[date, float]],
     locale: str,
     currency: str,
-    title_key: str = 'stats.daily_expenses',
-    company_name: Optional[str] = None
-) -> io.BytesIO:
-    """Generate daily expenses chart"""
-    # Group by date
-    daily_data = {}
-    for trans in transactions:
-        date_key = trans.transaction_date.date()
-        if date_key not in daily_data:
-            daily_data[date_key] = 0
-        daily_data[date_key] += float(trans.amount_primary)
+    title_key: str,
+    company_name: Optional[str]
+) -> bytes:
+    """Render daily expenses bar chart"""
+    strings = _chart_strings(locale)
     
     # Prepare data
-    dates = sorted(daily_data.keys())
-    amounts = [daily_data[d] for d in dates]
+    dates = [d for d, _ in daily_totals]
+    amounts = np.array([amount for _, amount in daily_totals], dtype=np.float64)
     
     # Create figure
-    fig, ax = plt.subplots(figsize=(10, 6))
+    fig, ax = _new_figure('daily', figsize=(10, 6))
     
     # Bar chart
     bars = ax.bar(dates, amounts, color='skyblue', edgecolor='navy', alpha=0.7)
     
-    # Add value labels on bars
-    for bar, amount in zip(bars, amounts):
-        height = bar.get_height()
-        ax.text(bar.get_x() + bar.get_width()/2., height,
-                f'{amount:,.0f}',
+    # Add value labels on bars, only the peak day when there are too many bars to read
+    if len(bars) <= _MAX_POINT_LABELS:
+        ax.bar_label(bars, labels=[f'{amount:,.0f}' for amount in amounts], fontsize=9)
+    else:
+        peak = int(np.argmax(amounts))
+        ax.text(bars[peak].get_x() + bars[peak].get_width()/2., amounts[peak],
+                f'{amounts[peak]:,.0f}',
                 ha='center', va='bottom', fontsize=9)
     
     # Format
-    ax.set_xlabel(i18n.get('stats.date', locale), fontsize=12)
-    ax.set_ylabel(f"{i18n.get('stats.amount', locale)} ({currency})", fontsize=12)
+    ax.set_xlabel(strings.date, fontsize=12)
+    ax.set_ylabel(f"{strings.amount} ({currency})", fontsize=12)
     if company_name:
         ax.set_title(f"{company_name} - {i18n.get(title_key, locale)}", fontsize=14, fontweight='bold')
     else:
         ax.set_title(i18n.get(title_key, locale), fontsize=14, fontweight='bold')
     
-    # Format x-axis
-    ax.xaxis.set_major_formatter(mdates.DateFormatter('%d.%m'))
-    ax.xaxis.set_major_locator(mdates.DayLocator())
-    plt.xticks(rotation=45)
+    # Format x-axis, by the span covered since days without expenses have no bar
+    _set_date_axis(ax, (dates[-1] - dates[0]).days + 1 if dates else 0)
+    ax.tick_params(axis='x', labelrotation=45)
     
     # Grid
     ax.grid(True, alpha=0.3)
     
-    # Average line
-    if amounts:
-        avg = sum(amounts) / len(amounts)
-        ax.axhline(y=avg, color='red', linestyle='--', alpha=0.7, 
-                   label=f"{i18n.get('stats.average', locale)}: {avg:,.0f} {currency}")
+    # Average line, over the days with expenses
+    if len(amounts):
+        avg = amounts.mean()
+        ax.axhline(y=avg, color='red', linestyle='--', alpha=0.7,
+                   label=f"{strings.average}: {avg:,.0f} {currency}")
         ax.legend()
     
-    plt.tight_layout()
-    
-    # Save to buffer
-    buffer = io.BytesIO()
-    plt.savefig(buffer, format='png', dpi=150, bbox_inches='tight')
-    buffer.seek(0)
-    plt.close()
-    
-    return buffer
+    return _figure_to_png(fig)
 
 
-async def generate_monthly_trend_chart(
-    transactions: List[Transaction],
+async def generate_daily_chart(
+    daily_totals: List[Tuple[date, float]],
     locale: str,
     currency: str,
+    title_key: str = 'stats.daily_expenses',
     company_name: Optional[str] = None
-) -> io.BytesIO:
-    """Generate monthly trend chart for all-time view"""
-    # Group by month
-    monthly_data = {}
-    for trans in transactions:
-        month_key = trans.transaction_date.strftime('%Y-%m')
-        if month_key not in monthly_data:
-            monthly_data[month_key] = 0
-        monthly_data[month_key] += float(trans.amount_primary)
-    
-    # Prepare data
-    months = sorted(monthly_data.keys())
-    amounts = [monthly_data[m] for m in months]
-    
-    # Convert month strings to dates for better formatting
-    month_dates = []
-    month_labels = []
-    for m in months:
-        try:
-            month_date = datetime.strptime(m, '%Y-%m')
-            month_dates.append(month_date)
-            month_labels.append(month_date.strftime('%m/%y'))
-        except:
-            month_dates.append(m)
-            month_labels.append(m)
+) -> _Chart:
+    """Generate daily expenses chart"""
+    return await _render_cached(
+        _chart_cache_key('daily', daily_totals, locale, currency, title_key, company_name),
+        _render_daily_chart, daily_totals, locale, currency, title_key, company_name
+    )
+
+
+def _render_monthly_trend_chart(
+    monthly_totals: List[Tuple[date, float]],
+    currency: str,
+    company_name: Optional[str]
+) -> bytes:
+    """Render monthly trend line chart"""
+    months = [m for m, _ in monthly_totals]
+    amounts = [amount for _, amount in monthly_totals]
+    month_labels = [m.strftime('%m/%y') for m in months]
     
     # Create figure
-    fig, ax = plt.subplots(figsize=(12, 6))
+    fig, ax = _new_figure('monthly', figsize=(12, 6))
     
     # Line chart with area fill
-    line = ax.plot(range(len(months)), amounts, marker='o', linewidth=3, markersize=8, color='blue', alpha=0.8)
+    ax.plot(range(len(months)), amounts, marker='o', linewidth=3, markersize=8, color='blue', alpha=0.8)
     ax.fill_between(range(len(months)), amounts, alpha=0.3, color='blue')
     
-    # Add value labels on points
-    for i, amount in enumerate(amounts):
-        ax.text(i, amount, f'{amount:,.0f}', ha='center', va='bottom', fontsize=9, fontweight='bold')
+    # Add value labels on points, only the peak and latest month on long histories
+    if len(amounts) <= _MAX_POINT_LABELS:
+        labelled = range(len(amounts))
+    else:
+        labelled = sorted({int(np.argmax(amounts)), len(amounts) - 1})
+    for i in labelled:
+        ax.text(i, amounts[i], f'{amounts[i]:,.0f}', ha='center', va='bottom', fontsize=9, fontweight='bold')
     
     # Format
     ax.set_xlabel("Месяц", fontsize=12)
@@ -216,62 +578,49 @@ async def generate_monthly_trend_chart(
     # Average line
     if amounts:
         avg = sum(amounts) / len(amounts)
-        ax.axhline(y=avg, color='red', linestyle='--', alpha=0.7, 
+        ax.axhline(y=avg, color='red', linestyle='--', alpha=0.7,
                    label=f"Среднее: {avg:,.0f} {currency}")
         ax.legend()
     
-    plt.tight_layout()
-    
-    # Save to buffer
-    buffer = io.BytesIO()
-    plt.savefig(buffer, format='png', dpi=150, bbox_inches='tight')
-    buffer.seek(0)
-    plt.close()
-    
-    return buffer
+    return _figure_to_png(fig)
 
 
-async def generate_category_pie_chart(
-    transactions: List[Transaction],
+async def generate_monthly_trend_chart(
+    monthly_totals: List[Tuple[date, float]],
     locale: str,
     currency: str,
     company_name: Optional[str] = None
-) -> io.BytesIO:
-    """Generate category pie chart"""
-    # Group by category
-    category_data = {}
-    category_names = {}
-    
-    for trans in transactions:
-        if trans.category:
-            cat_id = trans.category_id
-            if cat_id not in category_data:
-                category_data[cat_id] = 0
-                category_names[cat_id] = f"{trans.category.icon} {trans.category.get_name(locale)}"
-            category_data[cat_id] += float(trans.amount_primary)
+) -> _Chart:
+    """Generate monthly trend chart for all-time view from (first day of month, total) pairs"""
+    return await _render_cached(
+        _chart_cache_key('monthly', monthly_totals, currency, company_name),
+        _render_monthly_trend_chart, monthly_totals, currency, company_name
+    )
+
+
+def _render_category_pie_chart(
+    category_items: List[Tuple[str, float]],
+    locale: str,
+    currency: str,
+    company_name: Optional[str]
+) -> bytes:
+    """Render category pie chart"""
+    strings = _chart_strings(locale)
     
     # Prepare data
-    labels = []
-    sizes = []
-    colors = []
-    
-    # Sort by amount
-    sorted_cats = sorted(category_data.items(), key=lambda x: x[1], reverse=True)
-    
-    for cat_id, amount in sorted_cats:
-        labels.append(f"{category_names[cat_id]}\n{amount:,.0f} {currency}")
-        sizes.append(amount)
+    labels = [f"{name}\n{amount:,.0f} {currency}" for name, amount in category_items]
+    sizes = [amount for _, amount in category_items]
     
     # Create figure
-    fig, ax = plt.subplots(figsize=(10, 8))
+    fig, ax = _new_figure('pie', figsize=(10, 8))
     
     # Pie chart
     wedges, texts, autotexts = ax.pie(
-        sizes, 
-        labels=labels, 
+        sizes,
+        labels=labels,
         autopct='%1.1f%%',
         startangle=90,
-        colors=sns.color_palette("husl", len(sizes))
+        colors=_palette(len(sizes))
     )
     
     # Format
@@ -283,112 +632,220 @@ async def generate_category_pie_chart(
         autotext.set_weight('bold')
     
     if company_name:
-        ax.set_title(f"{company_name} - {i18n.get('stats.expenses_by_category', locale)}", 
+        ax.set_title(f"{company_name} - {strings.expenses_by_category}",
                      fontsize=14, fontweight='bold', pad=20)
     else:
-        ax.set_title(i18n.get('stats.expenses_by_category', locale), 
+        ax.set_title(strings.expenses_by_category,
                      fontsize=14, fontweight='bold', pad=20)
     
     # Equal aspect ratio
     ax.axis('equal')
     
-    plt.tight_layout()
+    return _figure_to_png(fig)
+
+
+def _pie_items(category_items: List[Tuple[str, float]], locale: str) -> List[Tuple[str, float]]:
+    """Keep the largest slices of an amount-sorted list and fold the tail into an Other slice"""
+    if len(category_items) <= _PIE_MAX_SLICES:
+        return category_items
     
-    # Save to buffer
-    buffer = io.BytesIO()
-    plt.savefig(buffer, format='png', dpi=150, bbox_inches='tight')
-    buffer.seek(0)
-    plt.close()
+    top = category_items[:_PIE_MAX_SLICES - 1]
+    rest = sum(amount for _, amount in category_items[_PIE_MAX_SLICES - 1:])
+    other = i18n.get_category('other', locale)
     
-    return buffer
+    # The user's own "Other" category may already be among the top slices
+    if any(name == other for name, _ in top):
+        return [(name, amount + rest if name == other else amount) for name, amount in top]
+    return top + [(other, rest)]
 
 
-async def generate_trend_chart(
-    transactions: List[Transaction],
+async def generate_category_pie_chart(
+    category_items: List[Tuple[str, float]],
+    locale: str,
+    currency: str,
+    company_name: Optional[str] = None
+) -> _Chart:
+    """Generate category pie chart from ("icon name", amount) pairs sorted by amount"""
+    category_items = _pie_items(category_items, locale)
+    return await _render_cached(
+        _chart_cache_key('pie', category_items, locale, currency, company_name),
+        _render_category_pie_chart, category_items, locale, currency, company_name
+    )
+
+
+def _render_category_bar_chart(
+    category_items: List[Tuple[str, float]],
+    locale: str,
+    currency: str,
+    company_name: Optional[str]
+) -> bytes:
+    """Render horizontal category comparison chart"""
+    strings = _chart_strings(locale)
+    categories = [name for name, _ in category_items]
+    amounts = [amount for _, amount in category_items]
+    
+    fig, ax = _new_figure('bar', figsize=(10, 8))
+    
+    # Horizontal bar chart
+    bars = ax.barh(categories, amounts, color=_palette(len(categories)))
+    
+    # Add values on bars
+    for bar, amount in zip(bars, amounts):
+        ax.text(bar.get_width(), bar.get_y() + bar.get_height()/2,
+               f' {amount:,.0f} {currency}',
+               ha='left', va='center', fontsize=10)
+    
+    ax.set_xlabel(f"{strings.amount} ({currency})", fontsize=12)
+    if company_name:
+        ax.set_title(f"{company_name} - {strings.expenses_by_category}",
+                    fontsize=14, fontweight='bold')
+    else:
+        ax.set_title(strings.expenses_by_category,
+                    fontsize=14, fontweight='bold')
+    ax.grid(True, alpha=0.3, axis='x')
+    
+    return _figure_to_png(fig)
+
+
+async def generate_category_bar_chart(
+    category_items: List[Tuple[str, float]],
     locale: str,
     currency: str,
-    period_days: int,
     company_name: Optional[str] = None
-) -> io.BytesIO:
-    """Generate trend chart over time"""
-    # Group by date
-    daily_data = {}
-    for trans in transactions:
-        date_key = trans.transaction_date.date()
-        if date_key not in daily_data:
-            daily_data[date_key] = 0
-        daily_data[date_key] += float(trans.amount_primary)
-    
-    # Fill missing dates with 0
-    if daily_data:
-        start_date = min(daily_data.keys())
-        end_date = max(daily_data.keys())
-        current_date = start_date
-        while current_date <= end_date:
-            if current_date not in daily_data:
-                daily_data[current_date] = 0
-            current_date += timedelta(days=1)
+) -> _Chart:
+    """Generate category comparison chart"""
+    return await _render_cached(
+        _chart_cache_key('bar', category_items, locale, currency, company_name),
+        _render_category_bar_chart, category_items, locale, currency, company_name
+    )
+
+
+def _render_trend_chart(
+    daily_totals: List[Tuple[date, float]],
+    locale: str,
+    currency: str,
+    company_name: Optional[str]
+) -> bytes:
+    """Render daily and cumulative trend charts"""
+    strings = _chart_strings(locale)
     
-    # Prepare data
-    dates = sorted(daily_data.keys())
-    amounts = [daily_data[d] for d in dates]
+    dates, amounts = _fill_days(daily_totals)
     
     # Calculate cumulative
-    cumulative = []
-    total = 0
-    for amount in amounts:
-        total += amount
-        cumulative.append(total)
+    cumulative = np.cumsum(amounts)
     
     # Create figure with 2 subplots
-    fig, (ax1, ax2) = plt.subplots(2, 1, figsize=(12, 10))
+    fig, (ax1, ax2) = _new_figure('trend', 2, 1, figsize=(12, 10))
     
     # Daily expenses line chart
     ax1.plot(dates, amounts, marker='o', linewidth=2, markersize=6, color='blue', alpha=0.7)
     ax1.fill_between(dates, amounts, alpha=0.3, color='blue')
     
     # Format ax1
-    ax1.set_xlabel(i18n.get('stats.date', locale), fontsize=12)
-    ax1.set_ylabel(f"{i18n.get('stats.daily_amount', locale)} ({currency})", fontsize=12)
+    ax1.set_xlabel(strings.date, fontsize=12)
+    ax1.set_ylabel(f"{strings.daily_amount} ({currency})", fontsize=12)
     if company_name:
-        ax1.set_title(f"{company_name} - {i18n.get('stats.daily_trend', locale)}", fontsize=14, fontweight='bold')
+        ax1.set_title(f"{company_name} - {strings.daily_trend}", fontsize=14, fontweight='bold')
     else:
-        ax1.set_title(i18n.get('stats.daily_trend', locale), fontsize=14, fontweight='bold')
+        ax1.set_title(strings.daily_trend, fontsize=14, fontweight='bold')
     ax1.grid(True, alpha=0.3)
-    ax1.xaxis.set_major_formatter(mdates.DateFormatter('%d.%m'))
+    _set_date_axis(ax1, len(dates))
     
     # Cumulative expenses
     ax2.plot(dates, cumulative, linewidth=3, color='green', alpha=0.8)
     ax2.fill_between(dates, cumulative, alpha=0.3, color='green')
     
     # Format ax2
-    ax2.set_xlabel(i18n.get('stats.date', locale), fontsize=12)
-    ax2.set_ylabel(f"{i18n.get('stats.cumulative_amount', locale)} ({currency})", fontsize=12)
+    ax2.set_xlabel(strings.date, fontsize=12)
+    ax2.set_ylabel(f"{strings.cumulative_amount} ({currency})", fontsize=12)
     if company_name:
-        ax2.set_title(f"{company_name} - {i18n.get('stats.cumulative_trend', locale)}", fontsize=14, fontweight='bold')
+        ax2.set_title(f"{company_name} - {strings.cumulative_trend}", fontsize=14, fontweight='bold')
     else:
-        ax2.set_title(i18n.get('stats.cumulative_trend', locale), fontsize=14, fontweight='bold')
+        ax2.set_title(strings.cumulative_trend, fontsize=14, fontweight='bold')
     ax2.grid(True, alpha=0.3)
-    ax2.xaxis.set_major_formatter(mdates.DateFormatter('%d.%m'))
+    _set_date_axis(ax2, len(dates))
     
     # Rotate x labels
     for ax in [ax1, ax2]:
-        plt.setp(ax.xaxis.get_majorticklabels(), rotation=45)
+        ax.tick_params(axis='x', labelrotation=45)
     
-    plt.tight_layout()
+    return _figure_to_png(fig)
+
+
+async def generate_trend_chart(
+    daily_totals: List[Tuple[date, float]],
+    locale: str,
+    currency: str,
+    company_name: Optional[str] = None
+) -> _Chart:
+    """Generate trend chart from the first to the last day with expenses"""
+    return await _render_cached(
+        _chart_cache_key('trend', daily_totals, locale, currency, company_name),
+        _render_trend_chart, daily_totals, locale, currency, company_name
+    )
+
+
+def _text_bar(pct: float, width: int = 10) -> str:
+    """Inline Unicode bar for a percentage"""
+    filled = max(0, min(width, round(pct / 100 * width)))
+    return '▇' * filled + '░' * (width - filled)
+
+
+def _category_bar_lines(category_items: List[Tuple[str, float]], total: float, currency: str) -> str:
+    """Text replacement for the category chart when there are only a few categories"""
+    lines = ""
+    for name, amount in category_items:
+        pct = amount / total * 100 if total > 0 else 0
+        lines += f"  {_text_bar(pct)} {name}: {expense_parser.format_amount(amount, currency)} ({pct:.0f}%)\n"
+    return lines
+
+
+def _chart_media(chart: _Chart, filename: str):
+    """File_id as is, PNG bytes wrapped for upload"""
+    if isinstance(chart.media, str):
+        return chart.media
+    return BufferedInputFile(chart.media, filename=filename)
+
+
+async def _answer_while_rendering(message: Message, text: str, *chart_tasks: Optional[asyncio.Task]):
+    """Send the text report while its charts render; cancel the renders if the send fails"""
+    try:
+        await message.answer(text, parse_mode="HTML")
+    except BaseException:
+        pending = [task for task in chart_tasks if task]
+        for task in pending:
+            task.cancel()
+        # Retrieve their outcome so a failed render isn't reported as never retrieved
+        await asyncio.gather(*pending, return_exceptions=True)
+        raise
+
+
+async def _send_charts(message: Message, charts: List[Tuple[_Chart, str, str]]):
+    """Send (chart, filename, caption) charts, several of them as one album in a single API call
     
-    # Save to buffer
-    buffer = io.BytesIO()
-    plt.savefig(buffer, format='png', dpi=150, bbox_inches='tight')
-    buffer.seek(0)
-    plt.close()
+    File_ids of freshly uploaded charts are remembered so identical charts are resent without upload.
+    """
+    if len(charts) == 1:
+        chart, filename, caption = charts[0]
+        sent = [await message.answer_photo(_chart_media(chart, filename), caption=caption)]
+    elif charts:
+        sent = await message.answer_media_group([
+            InputMediaPhoto(media=_chart_media(chart, filename), caption=caption)
+            for chart, filename, caption in charts
+        ])
+    else:
+        return
     
-    return buffer
+    for (chart, _, _), sent_message in zip(charts, sent):
+        if not isinstance(chart.media, str) and sent_message.photo:
+            _chart_file_ids[chart.key] = sent_message.photo[-1].file_id
+            _chart_cache.pop(chart.key, None)
 
 
 async def report_day(message: Message):
     """Daily report with charts"""
     telegram_id = message.from_user.id
+    today = date.today()
     
     async with get_session() as session:
         user = await user_service.get_user_by_telegram_id(session, telegram_id)
@@ -406,20 +863,26 @@ async def report_day(message: Message):
             currency = user.active_company.primary_currency
         
         # Get today's data
-        today = date.today()
-        transactions = await get_period_data(session, user.id, today, today, user.active_company_id)
+        category_stats = await get_category_totals(session, user.id, today, today, user.active_company_id)
+        
+        # Calculate stats
+        total = 0.0
+        count = 0
+        for stat in category_stats:
+            total += stat.total
+            count += stat.count
         
         # Debug info
-        logger.info(f"[ANALYTICS] User {user.id}, active_company_id: {user.active_company_id}")
-        logger.info(f"[ANALYTICS] Found {len(transactions)} transactions for {today}")
+        logger.debug("[ANALYTICS] User %s, active_company_id: %s", user.id, user.active_company_id)
+        logger.debug("[ANALYTICS] Found %s transactions for %s", count, today)
         
-        if not transactions:
+        if not count:
             # Check if there are any transactions at all for this user
-            all_transactions = await get_period_data(session, user.id, date(2020, 1, 1), date(2030, 12, 31), user.active_company_id)
+            all_count = await count_transactions(session, user.id, None, None, user.active_company_id)
             debug_msg = f"📊 Нет данных за сегодня ({today.strftime('%d.%m.%Y')})\n\n"
             
-            if all_transactions:
-                debug_msg += f"💡 У вас есть {len(all_transactions)} транзакций за весь период.\n"
+            if all_count:
+                debug_msg += f"💡 У вас есть {all_count} транзакций за весь период.\n"
                 debug_msg += "Попробуйте выбрать другой период: неделю или месяц."
             else:
                 debug_msg += "💡 У вас пока нет ни одной транзакции.\n"
@@ -431,10 +894,6 @@ async def report_day(message: Message):
             await message.answer(debug_msg, parse_mode="HTML")
             return
         
-        # Calculate stats
-        total = sum(float(t.amount_primary) for t in transactions)
-        count = len(transactions)
-        
         # Generate text report
         if company_name:
             report = f"📊 <b>{company_name}</b>\n"
@@ -444,35 +903,41 @@ async def report_day(message: Message):
         report += f"💰 {i18n.get('stats.total', locale)}: {expense_parser.format_amount(total, currency)}\n"
         report += f"📝 {i18n.get('stats.transactions', locale)}: {count}\n\n"
         
-        # Category breakdown
-        category_totals = {}
-        for trans in transactions:
-            if trans.category:
-                cat_name = f"{trans.category.icon} {trans.category.get_name(locale)}"
-                if cat_name not in category_totals:
-                    category_totals[cat_name] = 0
-                category_totals[cat_name] += float(trans.amount_primary)
+        # Category breakdown (already sorted by amount)
+        category_items = _category_items(category_stats, locale)
         
-        if category_totals:
+        show_chart = len(category_items) >= _MIN_CHART_CATEGORIES
+        if category_items:
             report += f"📂 {i18n.get('stats.by_categories', locale)}:\n"
-            for cat, amount in sorted(category_totals.items(), key=lambda x: x[1], reverse=True):
-                report += f"  {cat}: {expense_parser.format_amount(amount, currency)}\n"
-        
-        await message.answer(report, parse_mode="HTML")
+            if show_chart:
+                for cat, amount in category_items:
+                    report += f"  {cat}: {expense_parser.format_amount(amount, currency)}\n"
+            else:
+                report += _category_bar_lines(category_items, total, currency)
         
-        # Generate and send chart if more than 1 transaction
-        if count > 1:
-            chart_buffer = await generate_category_pie_chart(transactions, locale, currency, company_name)
-            await message.answer_photo(
-                BufferedInputFile(chart_buffer.getvalue(), filename="daily_report.png"),
-                caption=i18n.get("stats.chart_caption", locale)
+        # Render the chart while the text report is being sent
+        chart_task = None
+        if show_chart:
+            chart_task = asyncio.create_task(
+                generate_category_pie_chart(category_items, locale, currency, company_name)
             )
+        
+        await _answer_while_rendering(message, report, chart_task)
+        
+        if chart_task:
+            await _send_charts(message, [
+                (await chart_task, "daily_report.png", i18n.get("stats.chart_caption", locale))
+            ])
 
 
 async def report_week(message: Message):
     """Weekly report with charts"""
     telegram_id = message.from_user.id
     
+    # Last 7 days including today
+    today = date.today()
+    week_start = today - timedelta(days=6)
+    
     async with get_session() as session:
         user = await user_service.get_user_by_telegram_id(session, telegram_id)
         if not user:
@@ -488,12 +953,12 @@ async def report_week(message: Message):
             company_name = user.active_company.name
             currency = user.active_company.primary_currency
         
-        # Get week's data (last 7 days)
-        today = date.today()
-        week_start = today - timedelta(days=6)  # Last 7 days including today
-        transactions = await get_period_data(session, user.id, week_start, today, user.active_company_id)
+        # Get week's data
+        category_stats, daily_totals = await get_period_aggregates(
+            session, user.id, week_start, today, user.active_company_id
+        )
         
-        if not transactions:
+        if not category_stats:
             await message.answer(
                 i18n.get("stats.no_data", locale),
                 parse_mode="HTML"
@@ -501,8 +966,11 @@ async def report_week(message: Message):
             return
         
         # Calculate stats
-        total = sum(float(t.amount_primary) for t in transactions)
-        count = len(transactions)
+        total = 0.0
+        count = 0
+        for stat in category_stats:
+            total += stat.total
+            count += stat.count
         days_count = 7
         avg_daily = total / days_count
         
@@ -517,33 +985,40 @@ async def report_week(message: Message):
         report += f"📊 {i18n.get('stats.average_daily', locale)}: {expense_parser.format_amount(avg_daily, currency)}\n"
         report += f"📝 {i18n.get('stats.transactions', locale)}: {count}\n"
         
-        await message.answer(report, parse_mode="HTML")
-        
-        # Generate and send charts
+        # Render charts while the text report is being sent
         # Daily chart for week
-        daily_chart = await generate_daily_chart(
-            transactions, locale, currency, 
+        daily_task = asyncio.create_task(generate_daily_chart(
+            daily_totals, locale, currency,
             title_key='stats.weekly_expenses',
             company_name=company_name
-        )
-        await message.answer_photo(
-            BufferedInputFile(daily_chart.getvalue(), filename="weekly_daily.png"),
-            caption=i18n.get("stats.daily_breakdown", locale)
-        )
+        ))
+        # Category pie chart, or text bars in the report for just a few categories
+        pie_task = None
+        category_items = _category_items(category_stats, locale)
+        if len(category_items) >= _MIN_CHART_CATEGORIES:
+            pie_task = asyncio.create_task(generate_category_pie_chart(
+                category_items, locale, currency, company_name
+            ))
+        elif category_items:
+            report += f"\n📂 {i18n.get('stats.by_categories', locale)}:\n"
+            report += _category_bar_lines(category_items, total, currency)
         
-        # Category pie chart - show even for 1 transaction
-        if count >= 1:
-            pie_chart = await generate_category_pie_chart(transactions, locale, currency, company_name)
-            await message.answer_photo(
-                BufferedInputFile(pie_chart.getvalue(), filename="weekly_categories.png"),
-                caption=i18n.get("stats.category_breakdown", locale)
-            )
+        await _answer_while_rendering(message, report, daily_task, pie_task)
+        
+        charts = [(await daily_task, "weekly_daily.png", i18n.get("stats.daily_breakdown", locale))]
+        if pie_task:
+            charts.append((await pie_task, "weekly_categories.png", i18n.get("stats.category_breakdown", locale)))
+        await _send_charts(message, charts)
 
 
 async def report_month(message: Message):
     """Monthly report with charts"""
     telegram_id = message.from_user.id
     
+    # Last 30 days including today
+    today = date.today()
+    month_start = today - timedelta(days=29)
+    
     async with get_session() as session:
         user = await user_service.get_user_by_telegram_id(session, telegram_id)
         if not user:
@@ -559,12 +1034,12 @@ async def report_month(message: Message):
             company_name = user.active_company.name
             currency = user.active_company.primary_currency
         
-        # Get month's data (last 30 days)
-        today = date.today()
-        month_start = today - timedelta(days=29)  # Last 30 days including today
-        transactions = await get_period_data(session, user.id, month_start, today, user.active_company_id)
+        # Get month's data
+        category_stats, daily_totals = await get_period_aggregates(
+            session, user.id, month_start, today, user.active_company_id
+        )
         
-        if not transactions:
+        if not category_stats:
             await message.answer(
                 i18n.get("stats.no_data", locale),
                 parse_mode="HTML"
@@ -572,8 +1047,11 @@ async def report_month(message: Message):
             return
         
         # Calculate stats
-        total = sum(float(t.amount_primary) for t in transactions)
-        count = len(transactions)
+        total = 0.0
+        count = 0
+        for stat in category_stats:
+            total += stat.total
+            count += stat.count
         days_count = 30
         avg_daily = total / days_count
         
@@ -588,29 +1066,38 @@ async def report_month(message: Message):
         report += f"📊 {i18n.get('stats.average_daily', locale)}: {expense_parser.format_amount(avg_daily, currency)}\n"
         report += f"📝 {i18n.get('stats.transactions', locale)}: {count}\n"
         
-        await message.answer(report, parse_mode="HTML")
-        
-        # Generate and send charts
+        # Render charts while the text report is being sent
         # Trend chart
-        trend_chart = await generate_trend_chart(transactions, locale, currency, days_count, company_name)
-        await message.answer_photo(
-            BufferedInputFile(trend_chart.getvalue(), filename="monthly_trend.png"),
-            caption=i18n.get("stats.expense_trend", locale)
+        trend_task = asyncio.create_task(
+            generate_trend_chart(daily_totals, locale, currency, company_name)
         )
+        # Category pie chart, or text bars in the report for just a few categories
+        pie_task = None
+        category_items = _category_items(category_stats, locale)
+        if len(category_items) >= _MIN_CHART_CATEGORIES:
+            pie_task = asyncio.create_task(generate_category_pie_chart(
+                category_items, locale, currency, company_name
+            ))
+        elif category_items:
+            report += f"\n📂 {i18n.get('stats.by_categories', locale)}:\n"
+            report += _category_bar_lines(category_items, total, currency)
         
-        # Category pie chart - show even for 1 transaction
-        if count >= 1:
-            pie_chart = await generate_category_pie_chart(transactions, locale, currency, company_name)
-            await message.answer_photo(
-                BufferedInputFile(pie_chart.getvalue(), filename="monthly_categories.png"),
-                caption=i18n.get("stats.category_breakdown", locale)
-            )
+        await _answer_while_rendering(message, report, trend_task, pie_task)
+        
+        charts = [(await trend_task, "monthly_trend.png", i18n.get("stats.expense_trend", locale))]
+        if pie_task:
+            charts.append((await pie_task, "monthly_categories.png", i18n.get("stats.category_breakdown", locale)))
+        await _send_charts(message, charts)
 
 
 async def report_by_category(message: Message):
     """Category analysis report"""
     telegram_id = message.from_user.id
     
+    # Last 30 days
+    today = date.today()
+    start_date = today - timedelta(days=30)
+    
     async with get_session() as session:
         user = await user_service.get_user_by_telegram_id(session, telegram_id)
         if not user:
@@ -626,60 +1113,13 @@ async def report_by_category(message: Message):
             company_name = user.active_company.name
             currency = user.active_company.primary_currency
         
-        # Get last 30 days data
-        today = date.today()
-        start_date = today - timedelta(days=30)
-        
-        # Get category statistics based on mode
-        if user.active_company_id:
-            # Company mode - use company categories
-            result = await session.execute(
-                select(
-                    CompanyCategory.id,
-                    CompanyCategory.icon,
-                    CompanyCategory.name_ru,
-                    CompanyCategory.name_kz,
-                    func.sum(Transaction.amount_primary).label('total'),
-                    func.count(Transaction.id).label('count')
-                )
-                .join(Transaction, Transaction.category_id == CompanyCategory.id)
-                .join(CompanyTransaction, CompanyTransaction.transaction_id == Transaction.id)
-                .where(
-                    and_(
-                        CompanyTransaction.company_id == user.active_company_id,
-                        CompanyTransaction.status == 'approved',
-                        Transaction.transaction_date >= start_date,
-                        Transaction.is_deleted == False
-                    )
-                )
-                .group_by(CompanyCategory.id)
-                .order_by(func.sum(Transaction.amount_primary).desc())
-            )
-        else:
-            # Personal mode - use personal categories
-            result = await session.execute(
-                select(
-                    Category.id,
-                    Category.icon,
-                    Category.name_ru,
-                    Category.name_kz,
-                    func.sum(Transaction.amount_primary).label('total'),
-                    func.count(Transaction.id).label('count')
-                )
-                .join(Transaction, Transaction.category_id == Category.id)
-                .where(
-                    and_(
-                        Transaction.user_id == user.id,
-                        Transaction.company_id == None,
-                        Transaction.transaction_date >= start_date,
-                        Transaction.is_deleted == False
-                    )
-                )
-                .group_by(Category.id)
-                .order_by(func.sum(Transaction.amount_primary).desc())
+        # Get category statistics (company transactions reference regular categories too)
+        category_stats = [
+            stat for stat in await get_category_totals(
+                session, user.id, start_date, today, user.active_company_id
             )
-        
-        category_stats = result.all()
+            if stat.id is not None
+        ]
         
         if not category_stats:
             await message.answer(
@@ -688,77 +1128,49 @@ async def report_by_category(message: Message):
             )
             return
         
-        # Generate report
+        # Generate report, joined once at the end
+        parts = []
         if company_name:
-            report = f"💰 <b>{company_name}</b>\n"
-            report += f"<b>{i18n.get('stats.category_analysis', locale)}</b>\n"
+            parts.append(f"💰 <b>{company_name}</b>\n")
+            parts.append(f"<b>{i18n.get('stats.category_analysis', locale)}</b>\n")
         else:
-            report = f"💰 <b>{i18n.get('stats.category_analysis', locale)}</b>\n"
-        report += f"📅 {i18n.get('stats.last_30_days', locale)}\n\n"
+            parts.append(f"💰 <b>{i18n.get('stats.category_analysis', locale)}</b>\n")
+        parts.append(f"📅 {i18n.get('stats.last_30_days', locale)}\n\n")
         
         total_all = sum(stat.total for stat in category_stats)
+        show_chart = len(category_stats) >= _MIN_CHART_CATEGORIES
+        transactions_label = i18n.get('stats.transactions', locale)
+        average_label = i18n.get('stats.average', locale)
         
         for stat in category_stats:
             cat_name = stat.name_ru if locale == 'ru' else stat.name_kz
             percentage = (stat.total / total_all) * 100 if total_all > 0 else 0
             
-            report += f"{stat.icon} <b>{cat_name}</b>\n"
-            report += f"  💵 {expense_parser.format_amount(stat.total, currency)}"
-            report += f" ({percentage:.1f}%)\n"
-            report += f"  📝 {i18n.get('stats.transactions', locale)}: {stat.count}\n"
-            report += f"  📊 {i18n.get('stats.average', locale)}: "
-            report += f"{expense_parser.format_amount(stat.total / stat.count if stat.count > 0 else 0, currency)}\n\n"
+            parts.append(f"{stat.icon} <b>{cat_name}</b>\n")
+            if not show_chart:
+                parts.append(f"  {_text_bar(percentage)}\n")
+            parts.append(f"  💵 {expense_parser.format_amount(stat.total, currency)} ({percentage:.1f}%)\n")
+            parts.append(f"  📝 {transactions_label}: {stat.count}\n")
+            parts.append(
+                f"  📊 {average_label}: "
+                f"{expense_parser.format_amount(stat.total / stat.count if stat.count > 0 else 0, currency)}\n\n"
+            )
         
-        report += f"💰 <b>{i18n.get('stats.total', locale)}: "
-        report += f"{expense_parser.format_amount(total_all, currency)}</b>"
+        parts.append(f"💰 <b>{i18n.get('stats.total', locale)}: {expense_parser.format_amount(total_all, currency)}</b>")
         
-        await message.answer(report, parse_mode="HTML")
+        # Chart straight from the aggregate, rendered while the text report is being sent
+        chart_task = None
+        if show_chart:
+            chart_task = asyncio.create_task(generate_category_bar_chart(
+                _category_items(category_stats, locale), locale, currency, company_name
+            ))
         
-        # Get transactions for chart
-        transactions = await get_period_data(session, user.id, start_date, today, user.active_company_id)
+        await _answer_while_rendering(message, "".join(parts), chart_task)
         
-        if len(transactions) > 1:
-            # Generate category comparison chart
-            fig, ax = plt.subplots(figsize=(10, 8))
-            
-            categories = []
-            amounts = []
-            
-            for stat in category_stats:
-                cat_name = stat.name_ru if locale == 'ru' else stat.name_kz
-                categories.append(f"{stat.icon} {cat_name}")
-                amounts.append(float(stat.total))
-            
-            # Horizontal bar chart
-            bars = ax.barh(categories, amounts, color=sns.color_palette("husl", len(categories)))
-            
-            # Add values on bars
-            for i, (bar, amount) in enumerate(zip(bars, amounts)):
-                ax.text(bar.get_width(), bar.get_y() + bar.get_height()/2,
-                       f' {amount:,.0f} {currency}',
-                       ha='left', va='center', fontsize=10)
-            
-            ax.set_xlabel(f"{i18n.get('stats.amount', locale)} ({currency})", fontsize=12)
-            if company_name:
-                ax.set_title(f"{company_name} - {i18n.get('stats.expenses_by_category', locale)}", 
-                            fontsize=14, fontweight='bold')
-            else:
-                ax.set_title(i18n.get('stats.expenses_by_category', locale), 
-                            fontsize=14, fontweight='bold')
-            ax.grid(True, alpha=0.3, axis='x')
-            
-            plt.tight_layout()
-            
-            # Save to buffer
-            buffer = io.BytesIO()
-            plt.savefig(buffer, format='png', dpi=150, bbox_inches='tight')
-            buffer.seek(0)
-            plt.close()
-            
-            await message.answer_photo(
-                BufferedInputFile(buffer.getvalue(), filename="category_analysis.png"),
-                caption=i18n.get("stats.category_comparison", locale)
-            )
+        if chart_task:
+            await _send_charts(message, [
+                (await chart_task, "category_analysis.png", i18n.get("stats.category_comparison", locale))
+            ])
 
 
 async def report_all_time(message: Message):
@@ -780,12 +1192,22 @@ async def report_all_time(message: Message):
             company_name = user.active_company.name
             currency = user.active_company.primary_currency
         
-        # Get all-time data (from 2020 to 2030 to cover all possible dates)
-        start_date = date(2020, 1, 1)
-        end_date = date(2030, 12, 31)
-        transactions = await get_period_data(session, user.id, start_date, end_date, user.active_company_id)
+        # Get all-time aggregates (no date bounds), cached until a transaction in this scope
+        # changes; a session can't run two statements at once, so months get their own connection
+        aggregates, generation = report_cache.get('all_time', user.id, user.active_company_id)
+        if aggregates is None:
+            async with get_session() as monthly_session:
+                aggregates = await asyncio.gather(
+                    get_category_totals(session, user.id, None, None, user.active_company_id),
+                    get_monthly_totals(monthly_session, user.id, None, None, user.active_company_id)
+                )
+            # Query helpers return [] on errors too; with any transactions both have rows,
+            # so only keep the pair when both queries returned some
+            if all(aggregates):
+                report_cache.set('all_time', user.id, user.active_company_id, aggregates, generation)
+        category_stats, monthly_stats = aggregates
         
-        if not transactions:
+        if not monthly_stats:
             no_data_msg = f"📋 <b>За все время</b>\n\n"
             no_data_msg += "💡 У вас пока нет ни одной транзакции.\n"
             if user.active_company_id:
@@ -796,83 +1218,77 @@ async def report_all_time(message: Message):
             await message.answer(no_data_msg, parse_mode="HTML")
             return
         
-        # Calculate comprehensive stats
-        total = sum(float(t.amount_primary) for t in transactions)
-        count = len(transactions)
+        # Calculate comprehensive stats from the monthly rows
+        total = 0.0
+        count = 0
+        monthly_totals = []
+        for month_key, month_total, month_count, _, _ in monthly_stats:
+            total += month_total
+            count += month_count
+            monthly_totals.append((month_key, month_total))
         
-        # Get date range
-        first_date = min(t.transaction_date.date() for t in transactions)
-        last_date = max(t.transaction_date.date() for t in transactions)
+        # Categories come sorted by amount, uncategorized excluded
+        category_items = _category_items(category_stats, locale)
+        
+        # Get date range (months are ordered)
+        first_date = monthly_stats[0][3].date()
+        last_date = monthly_stats[-1][4].date()
         days_range = (last_date - first_date).days + 1
         avg_daily = total / days_range if days_range > 0 else 0
         
-        # Get monthly stats
-        monthly_totals = {}
-        for trans in transactions:
-            month_key = trans.transaction_date.strftime('%Y-%m')
-            if month_key not in monthly_totals:
-                monthly_totals[month_key] = 0
-            monthly_totals[month_key] += float(trans.amount_primary)
-        
         # Generate text report
+        parts = []
         if company_name:
-            report = f"📋 <b>{company_name}</b>\n"
-            report += f"<b>За все время</b>\n"
+            parts.append(f"📋 <b>{company_name}</b>\n")
+            parts.append(f"<b>За все время</b>\n")
         else:
-            report = f"📋 <b>За все время</b>\n"
+            parts.append(f"📋 <b>За все время</b>\n")
         
-        report += f"📅 {first_date.strftime('%d.%m.%Y')} - {last_date.strftime('%d.%m.%Y')}\n\n"
-        report += f"💰 <b>Общая сумма</b>: {expense_parser.format_amount(total, currency)}\n"
-        report += f"📝 <b>Транзакций</b>: {count}\n"
-        report += f"📊 <b>Среднее в день</b>: {expense_parser.format_amount(avg_daily, currency)}\n"
-        report += f"📈 <b>Активных месяцев</b>: {len(monthly_totals)}\n\n"
+        parts.append(_ALL_TIME_SUMMARY.format(
+            first=first_date.strftime('%d.%m.%Y'),
+            last=last_date.strftime('%d.%m.%Y'),
+            total=expense_parser.format_amount(total, currency),
+            count=count,
+            avg_daily=expense_parser.format_amount(avg_daily, currency),
+            months=len(monthly_totals)
+        ))
         
         # Top spending months
         if monthly_totals:
-            top_months = sorted(monthly_totals.items(), key=lambda x: x[1], reverse=True)[:3]
-            report += f"<b>Топ месяцы по расходам:</b>\n"
+            top_months = nlargest(3, monthly_totals, key=itemgetter(1))
+            parts.append(f"<b>Топ месяцы по расходам:</b>\n")
             for month, amount in top_months:
-                try:
-                    month_date = datetime.strptime(month, '%Y-%m')
-                    month_name = month_date.strftime('%B %Y')
-                    report += f"  {month_name}: {expense_parser.format_amount(amount, currency)}\n"
-                except:
-                    report += f"  {month}: {expense_parser.format_amount(amount, currency)}\n"
-            report += "\n"
+                parts.append(f"  {month.strftime('%B %Y')}: {expense_parser.format_amount(amount, currency)}\n")
+            parts.append("\n")
         
         # Category breakdown (top 5)
-        category_totals = {}
-        for trans in transactions:
-            if trans.category:
-                cat_name = f"{trans.category.icon} {trans.category.get_name(locale)}"
-                if cat_name not in category_totals:
-                    category_totals[cat_name] = 0
-                category_totals[cat_name] += float(trans.amount_primary)
-        
-        if category_totals:
-            top_categories = sorted(category_totals.items(), key=lambda x: x[1], reverse=True)[:5]
-            report += f"<b>Топ категории:</b>\n"
-            for cat, amount in top_categories:
+        if category_items:
+            parts.append(f"<b>Топ категории:</b>\n")
+            for cat, amount in category_items[:5]:
                 percentage = (amount / total) * 100 if total > 0 else 0
-                report += f"  {cat}: {expense_parser.format_amount(amount, currency)} ({percentage:.1f}%)\n"
+                parts.append(f"  {cat}: {expense_parser.format_amount(amount, currency)} ({percentage:.1f}%)\n")
+                if len(category_items) < _MIN_CHART_CATEGORIES:
+                    parts.append(f"  {_text_bar(percentage)}\n")
         
-        await message.answer(report, parse_mode="HTML")
-        
-        # Generate and send comprehensive charts
+        # Render comprehensive charts concurrently while the text report is being sent
+        chart_tasks = []
         # 1. Monthly trend chart
         if len(monthly_totals) > 1:
-            monthly_trend_chart = await generate_monthly_trend_chart(
-                transactions, locale, currency, company_name
-            )
-            await message.answer_photo(
-                BufferedInputFile(monthly_trend_chart.getvalue(), filename="monthly_trend.png"),
-                caption="📈 Тренд расходов по месяцам"
-            )
+            chart_tasks.append((
+                asyncio.create_task(generate_monthly_trend_chart(monthly_totals, locale, currency, company_name)),
+                "monthly_trend.png", "📈 Тренд расходов по месяцам"
+            ))
         
         # 2. Category pie chart
-        if len(category_totals) > 1:
-            pie_chart = await generate_category_pie_chart(transactions, locale, currency, company_name)
-            await message.answer_photo(
-                BufferedInputFile(pie_chart.getvalue(), filename="all_time_categories.png"),
-                caption="🥧 Распределение по категориям за все время"
-            )
\ No newline at end of file
+        if len(category_items) >= _MIN_CHART_CATEGORIES:
+            chart_tasks.append((
+                asyncio.create_task(generate_category_pie_chart(category_items, locale, currency, company_name)),
+                "all_time_categories.png", "🥧 Распределение по категориям за все время"
+            ))
+        
+        await _answer_while_rendering(message, "".join(parts), *(task for task, _, _ in chart_tasks))
+        
+        # Send them in one album
+        await _send_charts(message, [
+            (await task, filename, caption) for task, filename, caption in chart_tasks
+        ])
@@ -1,22 +1,159 @@
+from functools import lru_cache
 from typing import Optional
 from aiogram import Router, F
 from aiogram.filters import StateFilter
-from aiogram.types import Message, CallbackQuery, InlineKeyboardButton
+from aiogram.types import Message, CallbackQuery, InlineKeyboardButton, InlineKeyboardMarkup
 from aiogram.utils.keyboard import InlineKeyboardBuilder
 from aiogram.fsm.context import FSMContext
+from sqlalchemy import delete
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from src.database import get_session
+from src.database.models import Transaction, Category
 from src.bot.states import SettingsStates
+from src.bot.keyboards.main import get_main_keyboard
+from src.bot.middlewares.user_context import UserContext, UserContextMiddleware, invalidate_user_context
 from src.services.user import UserService
+from src.services.transaction import TransactionService
+from src.services.category import CategoryService
+from src.services.report_cache import report_cache
 from src.utils.i18n import i18n
 from src.utils.text_parser import ExpenseParser
 from src.core.config import settings
 
 router = Router()
+# Settings menus re-render on every click; read-only ones use a cached user snapshot
+router.callback_query.middleware(UserContextMiddleware())
 user_service = UserService()
+transaction_service = TransactionService()
+category_service = CategoryService()
 expense_parser = ExpenseParser()
 
+# "Back to settings" button per locale, shared by every submenu
+_BACK_BUTTONS = {
+    locale: InlineKeyboardButton(text=i18n.get_button("back", locale), callback_data="back_to_settings")
+    for locale in i18n.translations
+}
+
+
+def _back_button(locale: str) -> InlineKeyboardButton:
+    """Prebuilt back button, Russian for unknown locales"""
+    return _BACK_BUTTONS.get(locale) or _BACK_BUTTONS['ru']
+
+
+# Timezones offered in settings, (label, tz name)
+TIMEZONES = (
+    ("🇰🇿 Алматы (UTC+6)", "Asia/Almaty"),
+    ("🇰🇿 Астана (UTC+6)", "Asia/Qostanay"),
+    ("🇷🇺 Москва (UTC+3)", "Europe/Moscow"),
+    ("🇷🇺 Екатеринбург (UTC+5)", "Asia/Yekaterinburg"),
+    ("🇷🇺 Новосибирск (UTC+7)", "Asia/Novosibirsk"),
+    ("🇷🇺 Владивосток (UTC+10)", "Asia/Vladivostok"),
+)
+
+# Their buttons are locale independent, so they are built once
+_TIMEZONE_BUTTONS = [
+    (tz_value, InlineKeyboardButton(text=tz_name, callback_data=f"set_timezone:{tz_value}"))
+    for tz_name, tz_value in TIMEZONES
+]
+
+
+def _settings_text(locale: str) -> str:
+    """Settings menu text"""
+    return f"<b>⚙️ {i18n.get('settings.title', locale)}</b>\n\nВыберите настройку:"
+
+
+@lru_cache(maxsize=512)
+def _build_settings_markup(
+    locale: str,
+    primary_currency: str,
+    timezone: str,
+    notifications_enabled: bool
+) -> InlineKeyboardMarkup:
+    """Settings menu keyboard, built once per combination of the settings it shows"""
+    # Create inline keyboard with all settings options
+    builder = InlineKeyboardBuilder()
+    
+    # Categories management
+    builder.button(
+        text=f"📂 {i18n.get('keyboard.categories', locale)}",
+        callback_data="settings:categories"
+    )
+    
+    # Export data
+    builder.button(
+        text=f"📤 {i18n.get('keyboard.export', locale)}",
+        callback_data="settings:export"
+    )
+    
+    # Language
+    builder.button(
+        text=f"🌐 Язык: {i18n.get('settings.language_name', locale)}",
+        callback_data="settings:language"
+    )
+    
+    # Currency
+    currency_symbol = expense_parser.SYMBOLS_BY_CURRENCY.get(primary_currency, '')
+    builder.button(
+        text=f"💱 Валюта: {currency_symbol} {primary_currency}",
+        callback_data="settings:currency"
+    )
+    
+    # Timezone
+    builder.button(
+        text=f"🕐 Часовой пояс: {timezone}",
+        callback_data="settings:timezone"
+    )
+    
+    # Notifications
+    notif_icon = "✅" if notifications_enabled else "❌"
+    builder.button(
+        text=f"🔔 Уведомления: {notif_icon}",
+        callback_data="settings:notifications"
+    )
+    
+    # Limits
+    builder.button(
+        text=f"🎯 {i18n.get('settings.limits', locale)}",
+        callback_data="settings:limits"
+    )
+    
+    # Clear data
+    builder.button(
+        text=f"🗑 {i18n.get('settings.clear_data', locale)}",
+        callback_data="settings:clear_data"
+    )
+    
+    # Layout: 1 button per row (single column)
+    builder.adjust(1)
+    
+    return builder.as_markup()
+
+
+def _settings_markup(user) -> InlineKeyboardMarkup:
+    """Settings menu keyboard for the user's current settings"""
+    return _build_settings_markup(
+        user.language_code,
+        user.primary_currency,
+        user.timezone,
+        user.notifications_enabled
+    )
+
+
+async def _show_settings(message: Message, user, state: FSMContext, edit: bool = False):
+    """Show settings menu for an already loaded user, editing the message in place when asked"""
+    # Clear any existing state
+    await state.clear()
+    
+    send = message.edit_text if edit else message.answer
+    await send(
+        _settings_text(user.language_code),
+        parse_mode="HTML",
+        reply_markup=_settings_markup(user)
+    )
+    
+    await state.set_state(SettingsStates.main_menu)
+
 
 @router.message(F.text == "/settings")
 @router.message(F.text.startswith("⚙️"))
@@ -30,130 +167,48 @@ async def cmd_settings(message: Message, state: FSMContext):
             # User not found - silently return (should not happen with proper bot setup)
             return
         
-        locale = user.language_code
-        
-        # Clear any existing state
-        await state.clear()
-        
-        # Create menu text
-        text = f"<b>⚙️ {i18n.get('settings.title', locale)}</b>\n\n"
-        text += "Выберите настройку:"
-        
-        # Create inline keyboard with all settings options
-        builder = InlineKeyboardBuilder()
-        
-        # Categories management
-        builder.button(
-            text=f"📂 {i18n.get('keyboard.categories', locale)}",
-            callback_data="settings:categories"
-        )
-        
-        # Export data
-        builder.button(
-            text=f"📤 {i18n.get('keyboard.export', locale)}",
-            callback_data="settings:export"
-        )
-        
-        # Language
-        lang_text = "🇷🇺 Русский" if locale == 'ru' else "🇰🇿 Қазақша"
-        builder.button(
-            text=f"🌐 Язык: {lang_text}",
-            callback_data="settings:language"
-        )
-        
-        # Currency
-        currency_symbol = expense_parser.CURRENCY_SYMBOLS.get(user.primary_currency, '')
-        builder.button(
-            text=f"💱 Валюта: {currency_symbol} {user.primary_currency}",
-            callback_data="settings:currency"
-        )
-        
-        # Timezone
-        builder.button(
-            text=f"🕐 Часовой пояс: {user.timezone}",
-            callback_data="settings:timezone"
-        )
-        
-        # Get notifications setting from user settings
-        user_settings = user.settings or {}
-        notifications_enabled = user_settings.get('notifications', True)
-        notif_icon = "✅" if notifications_enabled else "❌"
-        builder.button(
-            text=f"🔔 Уведомления: {notif_icon}",
-            callback_data="settings:notifications"
-        )
-        
-        # Limits
-        builder.button(
-            text=f"🎯 {i18n.get('settings.limits', locale)}",
-            callback_data="settings:limits"
-        )
-        
-        # Clear data
-        builder.button(
-            text=f"🗑 {i18n.get('settings.clear_data', locale)}",
-            callback_data="settings:clear_data"
-        )
-        
-        # Layout: 1 button per row (single column)
-        builder.adjust(1)
-        
-        await message.answer(
-            text,
-            parse_mode="HTML",
-            reply_markup=builder.as_markup()
-        )
-        
-        await state.set_state(SettingsStates.main_menu)
+        await _show_settings(message, user, state)
 
 
 @router.callback_query(F.data == "settings:language", StateFilter(SettingsStates.main_menu))
-async def show_language_settings(callback: CallbackQuery, state: FSMContext):
+async def show_language_settings(callback: CallbackQuery, state: FSMContext, user_context: Optional[UserContext] = None):
     """Show language selection"""
-    telegram_id = callback.from_user.id
+    user = user_context
+    if not user:
+        return
+    locale = user.language_code
     
-    async with get_session() as session:
-        user = await user_service.get_user_by_telegram_id(session, telegram_id)
-        locale = user.language_code
-        
-        text = f"<b>{i18n.get('settings.language', locale)}</b>\n\n"
-        current_lang_text = "Текущий язык" if locale == 'ru' else "Ағымдағы тіл"
-        text += f"{current_lang_text}: {'🇷🇺 Русский' if locale == 'ru' else '🇰🇿 Қазақша'}\n\n"
-        choose_lang_text = "Выберите язык" if locale == 'ru' else "Тілді таңдаңыз"
-        text += f"{choose_lang_text}:"
-        
-        builder = InlineKeyboardBuilder()
-        
-        if locale != 'ru':
-            builder.row(
-                InlineKeyboardButton(
-                    text="🇷🇺 Русский",
-                    callback_data="set_language:ru"
-                )
-            )
-        
-        if locale != 'kz':
-            builder.row(
-                InlineKeyboardButton(
-                    text="🇰🇿 Қазақша",
-                    callback_data="set_language:kz"
-                )
-            )
-        
+    text = f"<b>{i18n.get('settings.language', locale)}</b>\n\n"
+    text += f"{i18n.get('settings.current_language', locale)}: {i18n.get('settings.language_name', locale)}\n\n"
+    text += f"{i18n.get('settings.choose_language', locale)}:"
+    
+    builder = InlineKeyboardBuilder()
+    
+    if locale != 'ru':
         builder.row(
             InlineKeyboardButton(
-                text=i18n.get_button("back", locale),
-                callback_data="back_to_settings"
+                text="🇷🇺 Русский",
+                callback_data="set_language:ru"
             )
         )
-        
-        await callback.message.edit_text(
-            text,
-            parse_mode="HTML",
-            reply_markup=builder.as_markup()
+    
+    if locale != 'kz':
+        builder.row(
+            InlineKeyboardButton(
+                text="🇰🇿 Қазақша",
+                callback_data="set_language:kz"
+            )
         )
-        
-        await state.set_state(SettingsStates.changing_language)
+    
+    builder.row(_back_button(locale))
+    
+    await callback.message.edit_text(
+        text,
+        parse_mode="HTML",
+        reply_markup=builder.as_markup()
+    )
+    
+    await state.set_state(SettingsStates.changing_language)
 
 
 @router.callback_query(F.data.startswith("set_language:"), StateFilter(SettingsStates.changing_language))
@@ -164,6 +219,7 @@ async def set_language(callback: CallbackQuery, state: FSMContext):
     
     async with get_session() as session:
         user = await user_service.get_user_by_telegram_id(session, telegram_id)
+        invalidate_user_context(session, telegram_id)
         await user_service.update_user_language(session, user.id, new_language)
         
         await callback.answer(
@@ -171,60 +227,51 @@ async def set_language(callback: CallbackQuery, state: FSMContext):
         )
         
         # Update keyboard with new language
-        from src.bot.keyboards.main import get_main_keyboard
         await callback.message.answer(
             "✅",  # Simple confirmation
             reply_markup=get_main_keyboard(new_language)
         )
         
-        # Return to settings with new language
-        await state.set_state(SettingsStates.main_menu)
-        await cmd_settings(callback.message, state)
+        # Return to settings with new language, in place of the language list
+        await _show_settings(callback.message, user, state, edit=True)
 
 
 @router.callback_query(F.data == "settings:currency", StateFilter(SettingsStates.main_menu))
-async def show_currency_settings(callback: CallbackQuery, state: FSMContext):
+async def show_currency_settings(callback: CallbackQuery, state: FSMContext, user_context: Optional[UserContext] = None):
     """Show currency selection"""
-    telegram_id = callback.from_user.id
+    user = user_context
+    if not user:
+        return
+    locale = user.language_code
     
-    async with get_session() as session:
-        user = await user_service.get_user_by_telegram_id(session, telegram_id)
-        locale = user.language_code
-        
-        text = f"<b>{i18n.get('settings.currency', locale)}</b>\n\n"
-        current_currency_text = "Текущая валюта" if locale == 'ru' else "Ағымдағы валюта"
-        text += f"{current_currency_text}: {user.primary_currency}\n\n"
-        choose_currency_text = "Выберите основную валюту" if locale == 'ru' else "Негізгі валютаны таңдаңыз"
-        text += f"{choose_currency_text}:"
-        
-        builder = InlineKeyboardBuilder()
-        
-        for currency in settings.supported_currencies:
-            if currency != user.primary_currency:
-                symbol = expense_parser.CURRENCY_SYMBOLS.get(currency, '')
-                builder.add(
-                    InlineKeyboardButton(
-                        text=f"{symbol} {currency}",
-                        callback_data=f"set_primary_currency:{currency}"
-                    )
+    text = f"<b>{i18n.get('settings.currency', locale)}</b>\n\n"
+    text += f"{i18n.get('settings.current_currency', locale)}: {user.primary_currency}\n\n"
+    text += f"{i18n.get('settings.choose_currency', locale)}:"
+    
+    builder = InlineKeyboardBuilder()
+    
+    symbols = expense_parser.SYMBOLS_BY_CURRENCY
+    for currency in settings.supported_currencies:
+        if currency != user.primary_currency:
+            symbol = symbols.get(currency, '')
+            builder.add(
+                InlineKeyboardButton(
+                    text=f"{symbol} {currency}",
+                    callback_data=f"set_primary_currency:{currency}"
                 )
-        
-        builder.adjust(2)  # 2 buttons per row
-        
-        builder.row(
-            InlineKeyboardButton(
-                text=i18n.get_button("back", locale),
-                callback_data="back_to_settings"
             )
-        )
-        
-        await callback.message.edit_text(
-            text,
-            parse_mode="HTML",
-            reply_markup=builder.as_markup()
-        )
-        
-        await state.set_state(SettingsStates.changing_currency)
+    
+    builder.adjust(2)  # 2 buttons per row
+    
+    builder.row(_back_button(locale))
+    
+    await callback.message.edit_text(
+        text,
+        parse_mode="HTML",
+        reply_markup=builder.as_markup()
+    )
+    
+    await state.set_state(SettingsStates.changing_currency)
 
 
 @router.callback_query(F.data.startswith("set_primary_currency:"), StateFilter(SettingsStates.changing_currency))
@@ -235,15 +282,14 @@ async def set_primary_currency(callback: CallbackQuery, state: FSMContext):
     
     async with get_session() as session:
         user = await user_service.get_user_by_telegram_id(session, telegram_id)
+        invalidate_user_context(session, telegram_id)
         await user_service.update_user_currency(session, user.id, currency)
         
         locale = user.language_code
-        success_text = f"✅ Основная валюта изменена на {currency}" if locale == 'ru' else f"✅ Негізгі валюта {currency} болып өзгертілді"
-        await callback.answer(success_text)
+        await callback.answer(i18n.get('settings.currency_changed', locale, currency=currency))
         
-        # Return to settings
-        await state.set_state(SettingsStates.main_menu)
-        await cmd_settings(callback.message, state)
+        # Return to settings, in place of the selection list
+        await _show_settings(callback.message, user, state, edit=True)
 
 
 @router.callback_query(F.data == "settings:notifications", StateFilter(SettingsStates.main_menu))
@@ -255,89 +301,54 @@ async def toggle_notifications(callback: CallbackQuery, state: FSMContext):
         user = await user_service.get_user_by_telegram_id(session, telegram_id)
         locale = user.language_code
         
-        # Get current state
-        current_settings = user.settings or {}
-        notifications_enabled = current_settings.get('notifications_enabled', True)
-        
-        # Toggle
-        current_settings['notifications_enabled'] = not notifications_enabled
-        user.settings = current_settings
+        # Toggle, a single column update
+        notifications_enabled = user.notifications_enabled
+        user.notifications_enabled = not notifications_enabled
         
+        invalidate_user_context(session, telegram_id)
         await session.commit()
         
-        if locale == 'ru':
-            new_state = "включены" if not notifications_enabled else "выключены"
-            answer_text = f"✅ Уведомления {new_state}"
-        else:
-            new_state = "қосылды" if not notifications_enabled else "өшірілді"
-            answer_text = f"✅ Хабарландырулар {new_state}"
-        await callback.answer(answer_text)
+        answer_key = 'settings.notifications_disabled' if notifications_enabled else 'settings.notifications_enabled'
+        await callback.answer(i18n.get(answer_key, locale))
         
-        # Refresh settings
-        await cmd_settings(callback.message, state)
+        # Only the notifications button changes
+        await callback.message.edit_reply_markup(reply_markup=_settings_markup(user))
 
 
 @router.callback_query(F.data == "settings:limits", StateFilter(SettingsStates.main_menu))
-async def show_limits_settings(callback: CallbackQuery, state: FSMContext):
+async def show_limits_settings(callback: CallbackQuery, state: FSMContext, user_context: Optional[UserContext] = None):
     """Show spending limits settings"""
-    telegram_id = callback.from_user.id
-    async with get_session() as session:
-        user = await user_service.get_user_by_telegram_id(session, telegram_id)
-        locale = user.language_code
-        
-    message_text = "Управление лимитами в разработке" if locale == 'ru' else "Лимиттерді басқару әзірленуде"
-    await callback.answer(message_text, show_alert=True)
+    locale = user_context.language_code if user_context else 'ru'
+    await callback.answer(i18n.get('settings.limits_in_development', locale), show_alert=True)
 
 
 @router.callback_query(F.data == "settings:timezone", StateFilter(SettingsStates.main_menu))
-async def show_timezone_settings(callback: CallbackQuery, state: FSMContext):
+async def show_timezone_settings(callback: CallbackQuery, state: FSMContext, user_context: Optional[UserContext] = None):
     """Show timezone selection"""
-    telegram_id = callback.from_user.id
+    user = user_context
+    if not user:
+        return
+    locale = user.language_code
     
-    async with get_session() as session:
-        user = await user_service.get_user_by_telegram_id(session, telegram_id)
-        locale = user.language_code
-        
-        text = f"<b>{i18n.get('settings.timezone', locale)}</b>\n\n"
-        current_tz_text = "Текущий часовой пояс" if locale == 'ru' else "Ағымдағы уақыт белдеуі"
-        text += f"{current_tz_text}: {user.timezone}\n\n"
-        choose_tz_text = "Выберите часовой пояс" if locale == 'ru' else "Уақыт белдеуін таңдаңыз"
-        text += f"{choose_tz_text}:"
-        
-        builder = InlineKeyboardBuilder()
-        
-        timezones = [
-            ("🇰🇿 Алматы (UTC+6)", "Asia/Almaty"),
-            ("🇰🇿 Астана (UTC+6)", "Asia/Qostanay"),
-            ("🇷🇺 Москва (UTC+3)", "Europe/Moscow"),
-            ("🇷🇺 Екатеринбург (UTC+5)", "Asia/Yekaterinburg"),
-            ("🇷🇺 Новосибирск (UTC+7)", "Asia/Novosibirsk"),
-            ("🇷🇺 Владивосток (UTC+10)", "Asia/Vladivostok"),
-        ]
-        
-        for tz_name, tz_value in timezones:
-            if tz_value != user.timezone:
-                builder.row(
-                    InlineKeyboardButton(
-                        text=tz_name,
-                        callback_data=f"set_timezone:{tz_value}"
-                    )
-                )
-        
-        builder.row(
-            InlineKeyboardButton(
-                text=i18n.get_button("back", locale),
-                callback_data="back_to_settings"
-            )
-        )
-        
-        await callback.message.edit_text(
-            text,
-            parse_mode="HTML",
-            reply_markup=builder.as_markup()
-        )
-        
-        await state.set_state(SettingsStates.changing_timezone)
+    text = f"<b>{i18n.get('settings.timezone', locale)}</b>\n\n"
+    text += f"{i18n.get('settings.current_timezone', locale)}: {user.timezone}\n\n"
+    text += f"{i18n.get('settings.choose_timezone', locale)}:"
+    
+    builder = InlineKeyboardBuilder()
+    
+    for tz_value, button in _TIMEZONE_BUTTONS:
+        if tz_value != user.timezone:
+            builder.row(button)
+    
+    builder.row(_back_button(locale))
+    
+    await callback.message.edit_text(
+        text,
+        parse_mode="HTML",
+        reply_markup=builder.as_markup()
+    )
+    
+    await state.set_state(SettingsStates.changing_timezone)
 
 
 @router.callback_query(F.data.startswith("set_timezone:"), StateFilter(SettingsStates.changing_timezone))
@@ -348,72 +359,47 @@ async def set_timezone(callback: CallbackQuery, state: FSMContext):
     
     async with get_session() as session:
         user = await user_service.get_user_by_telegram_id(session, telegram_id)
+        invalidate_user_context(session, telegram_id)
         await user_service.update_user_timezone(session, user.id, timezone)
         
         locale = user.language_code
-        success_text = f"✅ Часовой пояс изменен на {timezone}" if locale == 'ru' else f"✅ Уақыт белдеуі {timezone} болып өзгертілді"
-        await callback.answer(success_text)
+        await callback.answer(i18n.get('settings.timezone_changed', locale, timezone=timezone))
         
-        # Return to settings
-        await state.set_state(SettingsStates.main_menu)
-        await cmd_settings(callback.message, state)
+        # Return to settings, in place of the selection list
+        await _show_settings(callback.message, user, state, edit=True)
 
 
 @router.callback_query(F.data == "settings:clear_data", StateFilter(SettingsStates.main_menu))
-async def show_clear_data_confirmation(callback: CallbackQuery, state: FSMContext):
+async def show_clear_data_confirmation(callback: CallbackQuery, state: FSMContext, user_context: Optional[UserContext] = None):
     """Show clear data confirmation dialog"""
-    telegram_id = callback.from_user.id
+    user = user_context
+    if not user:
+        return
+    locale = user.language_code
     
     async with get_session() as session:
-        user = await user_service.get_user_by_telegram_id(session, telegram_id)
-        locale = user.language_code
-        
         # Get transaction count
-        from src.services.transaction import TransactionService
-        transaction_service = TransactionService()
-        transactions = await transaction_service.get_user_transactions(
-            session, user.id, limit=None
-        )
-        transaction_count = len(transactions)
+        transaction_count = await transaction_service.count_user_transactions(session, user.id)
         
         if transaction_count == 0:
-            no_data_text = "У вас нет данных для удаления" if locale == 'ru' else "Сізде жою үшін деректер жоқ"
-            await callback.answer(no_data_text, show_alert=True)
+            await callback.answer(i18n.get('settings.no_data_to_clear', locale), show_alert=True)
             return
         
         # Warning text
-        if locale == 'ru':
-            text = f"<b>⚠️ Удаление всех данных</b>\n\n"
-            text += f"Вы уверены, что хотите удалить все ваши данные?\n\n"
-            text += f"Будет удалено:\n"
-            text += f"• {transaction_count} транзакций\n"
-            text += f"• Вся история расходов\n"
-            text += f"• Все настройки категорий\n\n"
-            text += f"<b>Это действие необратимо!</b>"
-        else:
-            text = f"<b>⚠️ Барлық деректерді жою</b>\n\n"
-            text += f"Барлық деректеріңізді жойғыңыз келетініне сенімдісіз бе?\n\n"
-            text += f"Жойылады:\n"
-            text += f"• {transaction_count} транзакция\n"
-            text += f"• Барлық шығыстар тарихы\n"
-            text += f"• Барлық санат параметрлері\n\n"
-            text += f"<b>Бұл әрекетті қайтару мүмкін емес!</b>"
+        text = i18n.get('settings.clear_data_confirm', locale, count=transaction_count)
         
         builder = InlineKeyboardBuilder()
         
         # Confirmation buttons
-        confirm_text = "🗑 Да, удалить всё" if locale == 'ru' else "🗑 Иә, барлығын жою"
-        cancel_text = "❌ Отмена" if locale == 'ru' else "❌ Бас тарту"
-        
         builder.row(
             InlineKeyboardButton(
-                text=confirm_text,
+                text=i18n.get('settings.clear_data_yes', locale),
                 callback_data="confirm_clear_data"
             )
         )
         builder.row(
             InlineKeyboardButton(
-                text=cancel_text,
+                text=i18n.get('settings.clear_data_cancel', locale),
                 callback_data="back_to_settings"
             )
         )
@@ -437,16 +423,9 @@ async def confirm_clear_data(callback: CallbackQuery, state: FSMContext):
         locale = user.language_code
         
         # Show processing message
-        processing_text = "🔄 Удаляю данные..." if locale == 'ru' else "🔄 Деректерді жою..."
-        await callback.message.edit_text(processing_text)
+        await callback.message.edit_text(i18n.get('settings.clearing_data', locale))
         
         try:
-            # Delete all transactions
-            from src.services.transaction import TransactionService
-            from src.services.category import CategoryService
-            from sqlalchemy import delete
-            from src.database.models import Transaction, Category
-            
             # Delete all user transactions
             await session.execute(
                 delete(Transaction).where(Transaction.user_id == user.id)
@@ -462,35 +441,31 @@ async def confirm_clear_data(callback: CallbackQuery, state: FSMContext):
             
             # Reset user settings to defaults
             user.settings = {}
+            user.notifications_enabled = True
             
-            await session.commit()
-            
-            # Recreate default categories
-            category_service = CategoryService()
+            # Recreate default categories, everything goes in a single commit
             await category_service.create_default_categories(session, user.id)
+            invalidate_user_context(session, telegram_id)
             await session.commit()
+            report_cache.invalidate(user.id, user.active_company_id)
             
             # Success message
-            success_text = "✅ Все данные успешно удалены" if locale == 'ru' else "✅ Барлық деректер сәтті жойылды"
-            await callback.message.edit_text(success_text)
-            
-            # Return to main menu after 2 seconds
-            import asyncio
-            await asyncio.sleep(2)
+            await callback.message.edit_text(i18n.get('settings.data_cleared', locale))
             
-            # Send welcome message
+            # Send welcome message right away, without holding the handler
             welcome_text = i18n.get("welcome.tutorial", locale)
             await callback.message.answer(welcome_text)
             
         except Exception as e:
-            error_text = "❌ Ошибка при удалении данных" if locale == 'ru' else "❌ Деректерді жою кезінде қате"
-            await callback.message.edit_text(error_text)
+            await callback.message.edit_text(i18n.get('settings.clear_data_error', locale))
             
         await state.clear()
 
 
 @router.callback_query(F.data == "back_to_settings")
-async def back_to_settings(callback: CallbackQuery, state: FSMContext):
+async def back_to_settings(callback: CallbackQuery, state: FSMContext, user_context: Optional[UserContext] = None):
     """Return to main settings menu"""
-    await state.set_state(SettingsStates.main_menu)
-    await cmd_settings(callback.message, state)
\ No newline at end of file
+    if not user_context:
+        return
+    
+    await _show_settings(callback.message, user_context, state, edit=True)
\ No newline at end of file
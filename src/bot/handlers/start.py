@@ -1,3 +1,4 @@
+from functools import lru_cache
 from aiogram import Router, F
 from aiogram.types import Message, CallbackQuery
 from aiogram.filters import CommandStart, StateFilter
@@ -8,6 +9,7 @@ from src.database import get_session, User, Category
 from src.database.models import Company
 from src.bot.keyboards import get_language_keyboard, get_confirm_keyboard
 from src.bot.keyboards.main import get_main_keyboard
+from src.bot.middlewares.user_context import cached_user_context
 from src.bot.states import RegistrationStates
 from src.utils.i18n import i18n
 from src.services.user import UserService
@@ -73,7 +75,7 @@ async def process_language_selection(callback: CallbackQuery, state: FSMContext)
             language_code=language
         )
         
-        # Create default categories (handled by trigger in DB)
+        # Default categories are created together with the user
         await session.commit()
     
     # Send welcome message and tutorial
@@ -95,16 +97,10 @@ async def process_language_selection(callback: CallbackQuery, state: FSMContext)
     await state.clear()
 
 
-@router.message(F.text == "/help")
-async def cmd_help(message: Message):
-    """Handle /help command"""
-    telegram_id = message.from_user.id
-    
-    async with get_session() as session:
-        user = await user_service.get_user_by_telegram_id(session, telegram_id)
-        locale = user.language_code if user else 'ru'
-    
-    help_text = f"""
+@lru_cache(maxsize=None)
+def _help_text(locale: str) -> str:
+    """Help text, rendered once per locale"""
+    return f"""
 {i18n.get("welcome.tutorial", locale)}
 
 📝 <b>Команды:</b>
@@ -119,5 +115,22 @@ async def cmd_help(message: Message):
 /rates - {i18n.get_command_description("rates", locale)}
 /convert - {i18n.get_command_description("convert", locale)}
 """
+
+
+@router.message(F.text == "/help")
+async def cmd_help(message: Message):
+    """Handle /help command"""
+    telegram_id = message.from_user.id
+    
+    # Settings menus keep a snapshot of the user; only query when there is none
+    context = cached_user_context(telegram_id)
+    if context:
+        locale = context.language_code
+    else:
+        async with get_session() as session:
+            user = await user_service.get_user_by_telegram_id(session, telegram_id)
+            locale = user.language_code if user else 'ru'
+    
+    help_text = _help_text(locale)
     
     await message.answer(help_text, parse_mode="HTML")
\ No newline at end of file
@@ -0,0 +1,72 @@
+"""Middleware providing a short-lived snapshot of the current user"""
+from dataclasses import dataclass
+from typing import Callable, Dict, Any, Awaitable, Optional
+from aiogram import BaseMiddleware
+from aiogram.types import Message, CallbackQuery
+from cachetools import TTLCache
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from src.database import get_session
+from src.database.base import run_after_commit
+from src.services.user import UserService
+
+
+@dataclass(frozen=True)
+class UserContext:
+    """Read-only copy of the user fields menus render from, safe to keep outside a session"""
+    id: int
+    telegram_id: int
+    language_code: str
+    primary_currency: str
+    timezone: str
+    notifications_enabled: bool = True
+
+
+# Snapshots by telegram id; handlers that change these fields call invalidate_user_context
+_user_contexts = TTLCache(maxsize=10000, ttl=30)
+
+
+def cached_user_context(telegram_id: int) -> Optional[UserContext]:
+    """Snapshot already cached for the user, if any, without touching the database"""
+    return _user_contexts.get(telegram_id)
+
+
+def invalidate_user_context(session: AsyncSession, telegram_id: int) -> None:
+    """Drop the cached snapshot once the session changing the user's settings commits
+    
+    Dropping it earlier would let a concurrent callback cache the pre-commit row again.
+    """
+    run_after_commit(session, lambda: _user_contexts.pop(telegram_id, None))
+
+
+class UserContextMiddleware(BaseMiddleware):
+    """Inject the user's snapshot as `user_context`, so quick menu clicks don't each query the user"""
+    
+    def __init__(self):
+        self.user_service = UserService()
+    
+    async def __call__(
+        self,
+        handler: Callable[[Message, Dict[str, Any]], Awaitable[Any]],
+        event: Message | CallbackQuery,
+        data: Dict[str, Any]
+    ) -> Any:
+        telegram_id = event.from_user.id
+        context: Optional[UserContext] = _user_contexts.get(telegram_id)
+        
+        if context is None:
+            async with get_session() as session:
+                user = await self.user_service.get_user_by_telegram_id(session, telegram_id)
+            if user:
+                context = UserContext(
+                    id=user.id,
+                    telegram_id=user.telegram_id,
+                    language_code=user.language_code,
+                    primary_currency=user.primary_currency,
+                    timezone=user.timezone,
+                    notifications_enabled=user.notifications_enabled
+                )
+                _user_contexts[telegram_id] = context
+        
+        data['user_context'] = context
+        return await handler(event, data)
@@ -50,6 +50,7 @@ class Settings(BaseSettings):
     use_google_vision: bool = Field(False, env="USE_GOOGLE_VISION")
     openai_api_key: Optional[str] = Field(None, env="OPENAI_API_KEY")
     use_openai_vision: bool = Field(False, env="USE_OPENAI_VISION")
+    ocr_concurrency: int = Field(os.cpu_count() or 1, env="OCR_CONCURRENCY")
     
     # Application Settings
     app_env: str = Field("development", env="APP_ENV")
@@ -57,6 +58,7 @@ class Settings(BaseSettings):
     timezone: str = Field("Asia/Almaty", env="TIMEZONE")
     default_language: str = Field("ru", env="DEFAULT_LANGUAGE")
     default_currency: str = Field("KZT", env="DEFAULT_CURRENCY")
+    chart_render_workers: int = Field(os.cpu_count() or 1, env="CHART_RENDER_WORKERS")
     
     # Hot Reload Configuration
     enable_hot_reload: bool = Field(False, env="ENABLE_HOT_RELOAD")
@@ -1,8 +1,9 @@
+from sqlalchemy import event
 from sqlalchemy.ext.asyncio import create_async_engine, AsyncSession, async_sessionmaker
-from sqlalchemy.orm import declarative_base
+from sqlalchemy.orm import Session, declarative_base
 from sqlalchemy.pool import NullPool
 from contextlib import asynccontextmanager
-from typing import AsyncGenerator
+from typing import AsyncGenerator, Callable
 
 from src.core.config import settings
 
@@ -24,6 +25,7 @@ if settings.is_development():
         echo=True,
         pool_pre_ping=True,
         poolclass=NullPool,
+        query_cache_size=1200,
         connect_args=connect_args
     )
 else:
@@ -40,6 +42,9 @@ else:
         pool_pre_ping=True,
         pool_size=5,
         max_overflow=10,
+        # Compiled-SQL LRU shared by all sessions; the default 500 entries is
+        # easily churned by the report/filter query variants
+        query_cache_size=1200,
         connect_args=connect_args
     )
 
@@ -50,6 +55,25 @@ async_session_maker = async_sessionmaker(
     expire_on_commit=False
 )
 
+# session.info key holding callbacks queued by run_after_commit
+_AFTER_COMMIT_CALLBACKS = "after_commit_callbacks"
+
+
+def run_after_commit(session: AsyncSession, callback: Callable[[], None]) -> None:
+    """Run callback once the session's transaction commits; it is dropped on rollback"""
+    session.info.setdefault(_AFTER_COMMIT_CALLBACKS, []).append(callback)
+
+
+@event.listens_for(Session, "after_commit")
+def _run_after_commit_callbacks(session: Session) -> None:
+    for callback in session.info.pop(_AFTER_COMMIT_CALLBACKS, ()):
+        callback()
+
+
+@event.listens_for(Session, "after_rollback")
+def _drop_after_commit_callbacks(session: Session) -> None:
+    session.info.pop(_AFTER_COMMIT_CALLBACKS, None)
+
 
 async def init_db():
     """Initialize database (create tables)"""
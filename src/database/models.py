@@ -9,7 +9,7 @@ from sqlalchemy import (
     DECIMAL, UniqueConstraint, Index
 )
 from sqlalchemy.orm import relationship
-from sqlalchemy.sql import func
+from sqlalchemy.sql import func, true
 
 from .base import Base
 
@@ -29,6 +29,7 @@ class User(Base):
     )
     timezone = Column(String(50), default='Asia/Almaty')
     is_active = Column(Boolean, default=True, index=True)
+    notifications_enabled = Column(Boolean, nullable=False, default=True, server_default=true())
     settings = Column(JSON)
     active_company_id = Column(String(36), ForeignKey('companies.id', ondelete='SET NULL'), nullable=True)
     created_at = Column(DateTime, server_default=func.now())
@@ -82,6 +83,10 @@ class Transaction(Base):
         Index('idx_user_date', 'user_id', 'transaction_date'),
         Index('idx_user_month', 'user_id', 'transaction_date', 'is_deleted'),
         Index('idx_amount_search', 'user_id', 'amount_primary', 'is_deleted'),
+        # Covers the report aggregates: equality columns (incl. company_id IS NULL for personal
+        # reports) first, then the date range, then the grouped/summed columns so MySQL can
+        # answer from the index alone
+        Index('idx_user_active_date_cat', 'user_id', 'company_id', 'is_deleted', 'transaction_date', 'category_id', 'amount_primary'),
     )
     
     id = Column(String(36), primary_key=True, default=lambda: str(uuid4()))
@@ -340,6 +345,8 @@ class CompanyTransaction(Base):
     __tablename__ = "company_transactions"
     __table_args__ = (
         UniqueConstraint('transaction_id', name='uq_company_transaction'),
+        # Company reports: equality on company and status, then join to transactions from the index
+        Index('idx_company_status_transaction', 'company_id', 'status', 'transaction_id'),
     )
     
     id = Column(Integer, primary_key=True, autoincrement=True)
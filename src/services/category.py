@@ -204,19 +204,24 @@ class CategoryService:
             ('Прочее', 'Басқа', '💰', 9)
         ]
         
+        # Existing defaults in one query instead of one per category
+        result = await session.execute(
+            select(Category).where(
+                and_(
+                    Category.user_id == user_id,
+                    Category.name_ru.in_([name_ru for name_ru, _, _, _ in default_categories]),
+                    Category.is_default == True
+                )
+            )
+        )
+        existing = {}
+        for category in result.scalars():
+            # Take only the first one if duplicates exist
+            existing.setdefault(category.name_ru, category)
+        
         categories = []
         for name_ru, name_kz, icon, position in default_categories:
-            # Check if category already exists
-            existing = await session.execute(
-                select(Category).where(
-                    and_(
-                        Category.user_id == user_id,
-                        Category.name_ru == name_ru,
-                        Category.is_default == True
-                    )
-                ).limit(1)
-            )
-            existing_category = existing.scalar_one_or_none()
+            existing_category = existing.get(name_ru)
             
             if not existing_category:
                 category = Category(
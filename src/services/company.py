@@ -11,6 +11,7 @@ from src.database.models import (
     Company, CompanyMember, CompanyCategory, CompanyTransaction, 
     ApprovalRule, User, Transaction
 )
+from src.services.report_cache import report_cache
 
 logger = logging.getLogger(__name__)
 
@@ -277,6 +278,7 @@ class CompanyService:
         company_tx.approved_at = datetime.now()
         
         await session.flush()
+        report_cache.invalidate_company_on_commit(session, company_tx.company_id)
         return True
     
     async def reject_transaction(
@@ -303,6 +305,7 @@ class CompanyService:
         company_tx.rejection_reason = reason
         
         await session.flush()
+        report_cache.invalidate_company_on_commit(session, company_tx.company_id)
         return True
     
     async def get_pending_approvals(
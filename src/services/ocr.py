@@ -1,5 +1,8 @@
 import re
+import asyncio
 import logging
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
 from typing import Dict, Optional, Any
 from datetime import datetime, date
 from decimal import Decimal, InvalidOperation
@@ -25,6 +28,114 @@ from .ocr_openai import OpenAIVisionService
 
 logger = logging.getLogger(__name__)
 
+# CPU-bound image work runs in worker processes so the event loop keeps serving updates
+_ocr_pool: Optional[ProcessPoolExecutor] = None
+_ocr_semaphore = asyncio.Semaphore(settings.ocr_concurrency)
+
+
+def _get_ocr_pool() -> ProcessPoolExecutor:
+    """Get (lazily create) the process pool for OCR image work"""
+    global _ocr_pool
+    if _ocr_pool is None:
+        _ocr_pool = ProcessPoolExecutor(max_workers=settings.ocr_concurrency)
+    return _ocr_pool
+
+
+async def _run_in_ocr_pool(func, *args):
+    """Run func in the OCR pool, recreating the pool and retrying once if a worker crashed"""
+    global _ocr_pool
+    pool = _get_ocr_pool()
+    try:
+        return await asyncio.get_running_loop().run_in_executor(pool, func, *args)
+    except BrokenProcessPool:
+        # A worker died (e.g. OOM on a large photo); don't keep the dead pool for every later receipt
+        logger.warning("OCR process pool is broken, recreating it")
+        pool.shutdown(wait=False)
+        if _ocr_pool is pool:
+            _ocr_pool = None
+        return await asyncio.get_running_loop().run_in_executor(_get_ocr_pool(), func, *args)
+
+
+def _downscale_image(image_bytes: bytes, max_side: int = 1920) -> bytes:
+    """Shrink large receipt photos to max_side on the long edge and re-encode as JPEG"""
+    if Image is None:
+        return image_bytes
+    
+    try:
+        im = Image.open(io.BytesIO(image_bytes))
+        if max(im.size) <= max_side:
+            return image_bytes
+        
+        im.thumbnail((max_side, max_side), Image.LANCZOS)
+        if im.mode != 'RGB':
+            im = im.convert('RGB')
+        out = io.BytesIO()
+        im.save(out, 'JPEG', quality=85, optimize=True)
+        return out.getvalue()
+    except Exception as e:
+        logger.warning(f"Failed to downscale image, using original: {e}")
+        return image_bytes
+
+
+def _preprocess_image(image: 'np.ndarray') -> 'np.ndarray':
+    """Preprocess image for better OCR results"""
+    if not OCR_AVAILABLE:
+        raise RuntimeError("OCR dependencies are not available")
+    
+    # Convert to grayscale
+    gray = cv2.cvtColor(image, cv2.COLOR_BGR2GRAY)
+    
+    # Apply threshold to get black and white image
+    _, thresh = cv2.threshold(gray, 0, 255, cv2.THRESH_BINARY + cv2.THRESH_OTSU)
+    
+    # Denoise
+    denoised = cv2.fastNlMeansDenoising(thresh)
+    
+    # Resize if too small
+    height, width = denoised.shape
+    if width < 1000:
+        scale = 1000 / width
+        new_width = int(width * scale)
+        new_height = int(height * scale)
+        denoised = cv2.resize(denoised, (new_width, new_height), interpolation=cv2.INTER_LINEAR)
+    
+    return denoised
+
+
+def _extract_text(image_bytes: bytes, tesseract_cmd: str) -> Optional[str]:
+    """Decode, preprocess and run Tesseract on image bytes (executed in a worker process)"""
+    pytesseract.pytesseract.tesseract_cmd = tesseract_cmd
+    
+    # Convert bytes to image
+    nparr = np.frombuffer(image_bytes, np.uint8)
+    image = cv2.imdecode(nparr, cv2.IMREAD_COLOR)
+    
+    # Preprocess image
+    processed_image = _preprocess_image(image)
+    
+    # Extract text using Tesseract
+    # Try with available languages
+    try:
+        return pytesseract.image_to_string(
+            processed_image,
+            lang='rus+eng',  # Russian and English
+            config='--psm 6'  # Assume uniform block of text
+        )
+    except pytesseract.TesseractNotFoundError:
+        logger.warning("Tesseract not found, skipping local OCR")
+        return None
+    except Exception as e:
+        logger.warning(f"Failed with rus+eng, trying eng only: {e}")
+        try:
+            return pytesseract.image_to_string(
+                processed_image,
+                lang='eng',  # English only fallback
+                config='--psm 6'  # Assume uniform block of text
+            )
+        except Exception:
+            logger.warning("Failed with eng, skipping local OCR")
+            return None
+
 
 class OCRService:
     """Service for OCR processing of receipts"""
@@ -72,6 +183,15 @@ class OCRService:
         """
         logger.info(f"[OCR SERVICE] Starting receipt processing, image size: {len(image_bytes)} bytes")
         
+        # OCR quality plateaus well below Telegram's max photo size, so send fewer bytes
+        if Image is not None:
+            try:
+                async with _ocr_semaphore:
+                    image_bytes = await _run_in_ocr_pool(_downscale_image, image_bytes)
+            except Exception as e:
+                # Downscaling is only an optimization, recognize the original photo instead
+                logger.warning(f"[OCR SERVICE] Failed to downscale image, using original: {e}")
+        
         # Try OpenAI Vision first if configured
         if self.openai_service and settings.use_openai_vision:
             logger.info("Using OpenAI Vision for OCR")
@@ -88,36 +208,11 @@ class OCRService:
         # Fallback to Tesseract
         logger.info("[OCR SERVICE] Using Tesseract for OCR")
         try:
-            # Convert bytes to image
-            nparr = np.frombuffer(image_bytes, np.uint8)
-            image = cv2.imdecode(nparr, cv2.IMREAD_COLOR)
-            logger.info(f"[OCR SERVICE] Image decoded, shape: {image.shape if image is not None else 'None'}")
-            
-            # Preprocess image
-            processed_image = self._preprocess_image(image)
-            
-            # Extract text using Tesseract
-            # Try with available languages
-            try:
-                text = pytesseract.image_to_string(
-                    processed_image,
-                    lang='rus+eng',  # Russian and English
-                    config='--psm 6'  # Assume uniform block of text
-                )
-            except pytesseract.TesseractNotFoundError:
-                logger.warning("Tesseract not found, skipping local OCR")
+            # Decode, preprocess and recognize in a worker process
+            async with _ocr_semaphore:
+                text = await _run_in_ocr_pool(_extract_text, image_bytes, settings.tesseract_path)
+            if text is None:
                 return None
-            except Exception as e:
-                logger.warning(f"Failed with rus+eng, trying eng only: {e}")
-                try:
-                    text = pytesseract.image_to_string(
-                        processed_image,
-                        lang='eng',  # English only fallback
-                        config='--psm 6'  # Assume uniform block of text
-                    )
-                except Exception:
-                    logger.warning("Failed with eng, skipping local OCR")
-                    return None
             
             logger.info(f"[OCR SERVICE] Extracted text: {text[:200]}...")
             
@@ -135,30 +230,6 @@ class OCRService:
             logger.error(f"[OCR SERVICE] OCR processing error: {e}", exc_info=True)
             return None
     
-    def _preprocess_image(self, image: 'np.ndarray') -> 'np.ndarray':
-        """Preprocess image for better OCR results"""
-        if not OCR_AVAILABLE:
-            raise RuntimeError("OCR dependencies are not available")
-        
-        # Convert to grayscale
-        gray = cv2.cvtColor(image, cv2.COLOR_BGR2GRAY)
-        
-        # Apply threshold to get black and white image
-        _, thresh = cv2.threshold(gray, 0, 255, cv2.THRESH_BINARY + cv2.THRESH_OTSU)
-        
-        # Denoise
-        denoised = cv2.fastNlMeansDenoising(thresh)
-        
-        # Resize if too small
-        height, width = denoised.shape
-        if width < 1000:
-            scale = 1000 / width
-            new_width = int(width * scale)
-            new_height = int(height * scale)
-            denoised = cv2.resize(denoised, (new_width, new_height), interpolation=cv2.INTER_LINEAR)
-        
-        return denoised
-    
     def _parse_receipt_text(self, text: str) -> Dict[str, Any]:
         """Parse receipt text and extract structured data"""
         result = {
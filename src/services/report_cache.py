@@ -0,0 +1,71 @@
+from typing import Any, Hashable, Optional, Tuple
+from cachetools import TTLCache
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from src.database.base import run_after_commit
+
+
+class ReportCache:
+    """In-process cache of report aggregates, dropped whenever a transaction in its scope changes
+    
+    A scope is a company (company mode reports cover every member's approved transactions) or a
+    user's personal transactions. The TTL bounds staleness from writes that don't invalidate,
+    e.g. changes made by another process.
+    """
+    
+    def __init__(self, ttl: int = 600):
+        # Scope -> {report name: value}, so a scope is dropped with a single pop
+        self._entries = TTLCache(maxsize=10_000, ttl=ttl)
+        # Bumped on every invalidation so a report computed concurrently with a write isn't stored.
+        # Expires like the entries; set() rejects values whose scope generation has expired
+        self._generations = TTLCache(maxsize=10_000, ttl=ttl)
+    
+    @staticmethod
+    def _scope(user_id: int, company_id: Optional[str]) -> Hashable:
+        return ('company', company_id) if company_id else ('user', user_id)
+    
+    def get(self, report: str, user_id: int, company_id: Optional[str] = None) -> Tuple[Any, int]:
+        """Return (cached value or None, generation to pass to set)"""
+        scope = self._scope(user_id, company_id)
+        generation = self._generations.get(scope)
+        if generation is None:
+            generation = self._generations[scope] = 0
+        return self._entries.get(scope, {}).get(report), generation
+    
+    def set(self, report: str, user_id: int, company_id: Optional[str], value: Any, generation: int) -> None:
+        """Store a value unless its scope was invalidated since the matching get"""
+        scope = self._scope(user_id, company_id)
+        if self._generations.get(scope) == generation:
+            self._entries.setdefault(scope, {})[report] = value
+    
+    def invalidate(self, user_id: int, company_id: Optional[str] = None) -> None:
+        """Drop cached reports for the user's personal scope and, if given, the company's"""
+        scopes = [self._scope(user_id, None)]
+        if company_id:
+            scopes.append(self._scope(user_id, company_id))
+        
+        for scope in scopes:
+            self._generations[scope] = self._generations.get(scope, 0) + 1
+            self._entries.pop(scope, None)
+    
+    def invalidate_company(self, company_id: str) -> None:
+        """Drop cached company reports, e.g. when a transaction's approval status changes"""
+        scope = ('company', company_id)
+        self._generations[scope] = self._generations.get(scope, 0) + 1
+        self._entries.pop(scope, None)
+    
+    def invalidate_on_commit(self, session: AsyncSession, user_id: int, company_id: Optional[str] = None) -> None:
+        """Invalidate once the session's writes commit
+        
+        Invalidating at flush would let a report running before the commit read the old rows and
+        store them under the new generation, where they'd be served until the TTL expires.
+        """
+        run_after_commit(session, lambda: self.invalidate(user_id, company_id))
+    
+    def invalidate_company_on_commit(self, session: AsyncSession, company_id: str) -> None:
+        """Company counterpart of invalidate_on_commit"""
+        run_after_commit(session, lambda: self.invalidate_company(company_id))
+
+
+# Singleton instance
+report_cache = ReportCache()
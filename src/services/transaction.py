@@ -6,6 +6,7 @@ from sqlalchemy import select, and_, or_, func, desc
 from uuid import uuid4
 
 from src.database.models import Transaction, Category, User
+from src.services.report_cache import report_cache
 
 
 class TransactionService:
@@ -57,6 +58,7 @@ class TransactionService:
         
         session.add(transaction)
         await session.flush()
+        report_cache.invalidate_on_commit(session, user_id, company_id)
         
         # If this is a company transaction, create company_transaction record
         if company_id:
@@ -142,6 +144,32 @@ class TransactionService:
         result = await session.execute(query)
         return result.scalars().all()
     
+    async def count_user_transactions(
+        self,
+        session: AsyncSession,
+        user_id: int
+    ) -> int:
+        """Count user's transactions without loading them"""
+        count = await session.scalar(
+            select(func.count(Transaction.id)).where(
+                and_(
+                    Transaction.user_id == user_id,
+                    Transaction.is_deleted == False
+                )
+            )
+        )
+        return count or 0
+    
+    async def create_and_get_today(
+        self,
+        session: AsyncSession,
+        **kwargs
+    ) -> Tuple[Transaction, Decimal]:
+        """Create transaction and return it with the user's total for today, in one DB transaction"""
+        transaction = await self.create_transaction(session, **kwargs)
+        today_total, _ = await self.get_today_spending(session, transaction.user_id)
+        return transaction, today_total
+    
     async def get_today_spending(
         self,
         session: AsyncSession,
@@ -273,6 +301,7 @@ class TransactionService:
                 setattr(transaction, key, value)
         
         await session.flush()
+        report_cache.invalidate_on_commit(session, user_id, transaction.company_id)
         return transaction
     
     async def delete_transaction(
@@ -289,6 +318,7 @@ class TransactionService:
         
         transaction.is_deleted = True
         await session.flush()
+        report_cache.invalidate_on_commit(session, user_id, transaction.company_id)
         return True
     
     async def search_transactions(
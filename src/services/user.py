@@ -4,6 +4,7 @@ from sqlalchemy import select
 from sqlalchemy.orm import joinedload
 
 from src.database.models import User
+from src.services.category import CategoryService
 
 
 class UserService:
@@ -41,6 +42,9 @@ class UserService:
         )
         session.add(user)
         await session.flush()
+        
+        # Make sure default categories exist up front so hot paths never need a fallback
+        await CategoryService().get_or_create_default_categories(session, user.id)
         return user
     
     async def update_user_language(
@@ -1,7 +1,7 @@
 import yaml
 import logging
 from pathlib import Path
-from typing import Dict, Any, Optional
+from typing import Dict, Any, Optional, Tuple
 
 logger = logging.getLogger(__name__)
 
@@ -12,6 +12,8 @@ class I18n:
     def __init__(self, locales_dir: str = "src/locales"):
         self.locales_dir = Path(locales_dir)
         self.translations: Dict[str, Dict[str, Any]] = {}
+        # Resolved (key, locale) lookups; keys and locales are a small finite set
+        self._cache: Dict[Tuple[str, str], Any] = {}
         self._load_translations()
     
     def _load_translations(self):
@@ -36,6 +38,23 @@ class I18n:
         if locale not in self.translations:
             locale = 'ru'  # Fallback to Russian
         
+        cache_key = (key, locale)
+        try:
+            value = self._cache[cache_key]
+        except KeyError:
+            value = self._cache[cache_key] = self._resolve(key, locale)
+        
+        # Format string with provided kwargs
+        if kwargs and isinstance(value, str):
+            try:
+                return value.format(**kwargs)
+            except KeyError:
+                return value
+        
+        return value
+    
+    def _resolve(self, key: str, locale: str) -> Any:
+        """Look up a dot-separated key, falling back to Russian"""
         keys = key.split('.')
         value = self.translations.get(locale, {})
         
@@ -49,19 +68,12 @@ class I18n:
         if value is None:
             # Try fallback to Russian
             if locale != 'ru':
-                fallback_value = self.get(key, 'ru', **kwargs)
+                fallback_value = self.get(key, 'ru')
                 logger.warning(f"Translation not found for key '{key}' in locale '{locale}', using Russian fallback: {fallback_value}")
                 return fallback_value
             logger.error(f"Translation not found for key '{key}' in any locale")
             return f"[{key}]"  # Return key if translation not found
         
-        # Format string with provided kwargs
-        if kwargs and isinstance(value, str):
-            try:
-                return value.format(**kwargs)
-            except KeyError:
-                return value
-        
         return value
     
     def get_button(self, button_key: str, locale: str = 'ru') -> str:
@@ -27,6 +27,12 @@ class ExpenseParser:
         'RM': 'MYR'  # Malaysian Ringgit
     }
     
+    # Reverse lookup for formatting, built once instead of on every format_amount call
+    SYMBOLS_BY_CURRENCY = {code: symbol for symbol, code in CURRENCY_SYMBOLS.items()}
+    
+    # Currencies whose symbol goes before the amount
+    PREFIX_CURRENCIES = frozenset({'USD', 'EUR', 'CNY'})
+    
     # Currency words
     CURRENCY_WORDS = {
         'тенге': 'KZT',
@@ -169,14 +175,13 @@ class ExpenseParser:
     
     def format_amount(self, amount: Decimal, currency: str = 'KZT') -> str:
         """Format amount with currency symbol"""
-        currency_symbols = {v: k for k, v in self.CURRENCY_SYMBOLS.items()}
-        symbol = currency_symbols.get(currency, currency)
+        symbol = self.SYMBOLS_BY_CURRENCY.get(currency, currency)
         
         # Format with thousands separator
         formatted = f"{amount:,.2f}".rstrip('0').rstrip('.')
         
         # Place symbol based on currency
-        if currency in ['USD', 'EUR', 'CNY']:
+        if currency in self.PREFIX_CURRENCIES:
             return f"{symbol}{formatted}"
         else:
             return f"{formatted}{symbol}"
\ No newline at end of file